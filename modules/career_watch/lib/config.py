@@ -4,6 +4,7 @@ import json
 import re
 from collections.abc import Mapping
 from dataclasses import dataclass, field
+from types import MappingProxyType
 from typing import Any
 
 from .utils import truthy
@@ -16,6 +17,10 @@ class ConfigError(ValueError):
     """Raised when provided kwargs/env cannot form a valid Settings."""
 
 
+# Shared read-only stand-in for "no params" (scrapers never mutate params)
+EMPTY_PARAMS: Mapping[str, Any] = MappingProxyType({})
+
+
 # -----------------------------
 # Models
 # -----------------------------
@@ -25,13 +30,14 @@ class ScraperConfig:
     One logical scraper invocation specification.
     - kind: scraper family (e.g., "workday", "lever", "greenhouse", "stub")
     - source: human-stable label used in output & DB (e.g., "workday:acme")
-    - params: arbitrary dict passed to the scraper; scraper will sequence
-              multiple companies internally if given.
+    - params: arbitrary mapping passed to the scraper; scraper will sequence
+              multiple companies internally if given. Read-only view built once
+              at config load, so scrapers read it directly instead of copying.
     """
 
     kind: str
     source: str
-    params: dict[str, Any] = field(default_factory=dict)
+    params: Mapping[str, Any] = field(default_factory=lambda: EMPTY_PARAMS)
 
 
 @dataclass
@@ -196,7 +202,7 @@ def _parse_scrapers_list(value: Any) -> list[ScraperConfig]:
             raise ConfigError(f"Item[{i}] requires 'kind' and 'source'.")
         if not isinstance(params, dict):
             raise ConfigError(f"Item[{i}].params must be an object.")
-        out.append(ScraperConfig(kind=str(kind), source=str(source), params=dict(params)))
+        out.append(ScraperConfig(kind=str(kind), source=str(source), params=MappingProxyType(dict(params))))
     return out
 
 
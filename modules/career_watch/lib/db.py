@@ -83,6 +83,52 @@ def filter_new(sqlite_path: str, person_env: str, postings: Iterable[Posting]) -
     return new_items
 
 
+# ---- HTTP validator cache (conditional GETs) --------------------------------
+
+
+def http_cache_get(sqlite_path: str, key: str) -> tuple[str | None, str | None, str, str] | None:
+    """
+    Return (etag, last_modified, body_sha256, body) stored for key, or None.
+    key is the request URL (plus a payload digest for POSTs).
+    """
+    init_db(sqlite_path)
+    with _connect(sqlite_path) as conn:
+        _apply_pragmas(conn)
+        row = conn.execute(
+            "SELECT etag, last_modified, body_sha256, body FROM http_cache WHERE key = ?",
+            (key,),
+        ).fetchone()
+    return (row[0], row[1], row[2], row[3]) if row else None
+
+
+def http_cache_put(
+    sqlite_path: str,
+    key: str,
+    *,
+    etag: str | None,
+    last_modified: str | None,
+    body_sha256: str,
+    body: str = "",
+) -> None:
+    """Upsert the validators + body digest for key."""
+    init_db(sqlite_path)
+    with _connect(sqlite_path) as conn:
+        _apply_pragmas(conn)
+        conn.execute(
+            """
+            INSERT INTO http_cache (key, etag, last_modified, body_sha256, body, fetched_utc)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+              etag = excluded.etag,
+              last_modified = excluded.last_modified,
+              body_sha256 = excluded.body_sha256,
+              body = excluded.body,
+              fetched_utc = excluded.fetched_utc
+            """,
+            (key, etag, last_modified, body_sha256, body, now_iso()),
+        )
+
+
 # ---- Nice-to-have helpers for tests & diagnostics --------------------------
 
 
@@ -151,3 +197,17 @@ def _ensure_schema(conn: sqlite3.Connection) -> None:
           ON postings (source, person, title, url);
         """
     )
+    # "latest postings" reports order by first_seen_utc
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_postings_first_seen ON postings (first_seen_utc);")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS http_cache (
+          key TEXT PRIMARY KEY,
+          etag TEXT,
+          last_modified TEXT,
+          body_sha256 TEXT NOT NULL,
+          body TEXT NOT NULL,
+          fetched_utc TEXT NOT NULL
+        );
+        """
+    )
@@ -88,6 +88,7 @@ def run_once(
         # Resolve and instantiate scraper
         scraper_cls = get_scraper_func(kind)
         scraper: BaseScraper = scraper_cls()
+        scraper.http_cache_path = settings.sqlite_path
         results = scraper.run(person_env, specs, skip_network=settings.skip_network)
 
         dt_us = int((time.perf_counter_ns() - t0) // 1000)
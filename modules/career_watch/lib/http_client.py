@@ -1,10 +1,14 @@
 # career_watch/http_client.py
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import threading
+import time
 from collections.abc import Mapping
 from typing import Any, Optional
+from urllib.parse import urlsplit
 
 import requests
 from requests.adapters import HTTPAdapter
@@ -13,6 +17,35 @@ from urllib3.util.retry import Retry
 LOG = logging.getLogger(__name__)
 
 
+# host -> time.monotonic() before which we should not hit that host again
+_HOST_NEXT: dict[str, float] = {}
+_HOST_LOCK = threading.Lock()
+
+
+def wait_for_host(url: str) -> None:
+    """Block until the politeness deadline for url's host (if any) has passed."""
+    host = urlsplit(url).netloc
+    with _HOST_LOCK:
+        deadline = _HOST_NEXT.get(host, 0.0)
+    wait = deadline - time.monotonic()
+    if wait > 0:
+        time.sleep(wait)
+
+
+def defer_host(url: str, delay: float) -> None:
+    """Record that url's host should not be fetched again for `delay` seconds."""
+    if delay <= 0:
+        return
+    host = urlsplit(url).netloc
+    with _HOST_LOCK:
+        _HOST_NEXT[host] = max(_HOST_NEXT.get(host, 0.0), time.monotonic() + delay)
+
+
+def body_digest(content: bytes) -> str:
+    """sha256 hex digest of a response body (used to detect unchanged pages)."""
+    return hashlib.sha256(content).hexdigest()
+
+
 class HttpClient:
     """Shared HTTP client with sane defaults and simple helpers."""
 
@@ -56,6 +89,47 @@ class HttpClient:
             resp.encoding = resp.apparent_encoding
         return resp.text
 
+    def get_text_cached(self, url: str, *, cache_path: str | None) -> tuple[str, bool]:
+        """
+        Conditional GET backed by the SQLite http_cache table at cache_path.
+
+        Sends If-None-Match / If-Modified-Since from the last fetch of url.
+        Returns (text, unchanged) where unchanged is True on a 304 or when the
+        body hashes the same as last time. Without cache_path this is get_text().
+        """
+        if not cache_path:
+            return self.get_text(url), False
+
+        from . import db
+
+        cached = db.http_cache_get(cache_path, url)
+        headers: dict[str, str] = {}
+        if cached:
+            etag, last_modified, _sha, _body = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        resp = self.session.get(url, headers=headers or None, timeout=self.timeout)
+        if resp.status_code == 304 and cached:
+            return cached[3], True
+        resp.raise_for_status()
+        if not resp.encoding and resp.apparent_encoding:
+            resp.encoding = resp.apparent_encoding
+        text = resp.text
+        sha = body_digest(resp.content)
+        unchanged = bool(cached) and cached[2] == sha
+        db.http_cache_put(
+            cache_path,
+            url,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            body_sha256=sha,
+            body=text,
+        )
+        return text, unchanged
+
     def get_json(
         self,
         url: str,
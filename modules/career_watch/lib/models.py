@@ -3,11 +3,12 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Posting:
     """
     A single job posting as returned by scrapers (pre-dedupe).
     Dedupe is performed externally against SQLite on (source, person_env, title, url).
+    Slotted: a run can hold thousands of these, and scrapers intern source/person_env.
     """
 
     source: str  # stable label like "lever:tenant" or "workday:org"
@@ -10,7 +10,7 @@ import time
 from typing import Any
 from urllib.parse import urljoin, urlsplit
 
-from ..config import ScraperConfig
+from ..config import EMPTY_PARAMS, ScraperConfig
 from ..http_client import HttpClient
 from ..models import Posting, ScrapeResult
 from .base import BaseScraper
@@ -86,7 +86,7 @@ class BaePhenomAPIScraper(BaseScraper):
         debug = os.getenv("JOBWATCH_DEBUG") == "1"
 
         for spec in specs:
-            params = dict(spec.params or {})
+            params = spec.params or EMPTY_PARAMS
             delay = float(params.get("delay_seconds") or 4.0)
             page_size = int(params.get("page_size") or 50)
             max_pages = int(params.get("max_pages") or 6)
@@ -27,6 +27,10 @@ class BaseScraper(ABC):
     # Concrete subclasses MUST set this to a stable string, e.g. "workday", "lever", "greenhouse", "stub"
     kind: str = ""
 
+    # SQLite path for the HTTP validator cache (ETag/Last-Modified); set by the engine.
+    # None disables conditional requests (e.g., live tests constructing scrapers directly).
+    http_cache_path: str | None = None
+
     @abstractmethod
     def run(
         self,
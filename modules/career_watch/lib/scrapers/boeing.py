@@ -11,7 +11,7 @@ from urllib.parse import urljoin, urlsplit
 
 from bs4 import BeautifulSoup  # pip install beautifulsoup4 html5lib
 
-from ..config import ScraperConfig
+from ..config import EMPTY_PARAMS, ScraperConfig
 from ..http_client import HttpClient
 from ..models import Posting, ScrapeResult
 from .base import BaseScraper
@@ -64,7 +64,7 @@ class BoeingScraper(BaseScraper):
 
         results: list[ScrapeResult] = []
         for spec in specs:
-            params = dict(spec.params or {})
+            params = spec.params or EMPTY_PARAMS
             start_urls: Sequence[tuple[str, str]] = []
 
             # Accept [["url","label"], ...] OR [{"url":..., "source":...}, ...]
@@ -33,7 +33,7 @@ from urllib.parse import parse_qs, urlencode, urljoin, urlparse
 
 from bs4 import BeautifulSoup
 
-from ..config import ScraperConfig
+from ..config import EMPTY_PARAMS, ScraperConfig
 from ..http_client import HttpClient
 from ..models import Posting, ScrapeResult
 from .base import BaseScraper
@@ -112,7 +112,7 @@ class IcimsScraper(BaseScraper):
         debug = True  # os.getenv("JOBWATCH_DEBUG") == "1"
 
         for spec in specs:
-            params = dict(spec.params or {})
+            params = spec.params or EMPTY_PARAMS
 
             targets = _normalize_targets(params.get("start_urls"))
             if not targets:
@@ -1,19 +1,40 @@
 # modules/career_watch/lib/scrapers/lever.py
 from __future__ import annotations
 
-import time
+import re
+import sys
 from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup  # pip install beautifulsoup4 html5lib
 
-from ..config import ScraperConfig
-from ..http_client import HttpClient
+from ..config import EMPTY_PARAMS, ScraperConfig
+from ..http_client import HttpClient, defer_host, wait_for_host
 from ..models import Posting, ScrapeResult
 from .base import BaseScraper
 from .registry import register
 
+# Prefer lxml for list pages (one XPath walk in C); fall back to BS4
+try:
+    import lxml.html
+    from lxml import etree
+
+    _POSTING_LINKS_XP: etree.XPath | None = etree.XPath(
+        '//div[contains(concat(" ", normalize-space(@class), " "), " postings-group ")]'
+        '//a[contains(concat(" ", normalize-space(@class), " "), " posting-title ")]'
+    )
+    _TITLE_XP: etree.XPath | None = etree.XPath('.//h5[@data-qa="posting-name"]')
+    _CATEGORIES_XP: etree.XPath | None = etree.XPath(
+        './/div[contains(concat(" ", normalize-space(@class), " "), " posting-categories ")]'
+    )
+except ImportError:
+    _POSTING_LINKS_XP = _TITLE_XP = _CATEGORIES_XP = None
+
+# (list_url, query, exclude) -> parsed (title, url) pairs from the last fetch.
+# Reused when the conditional GET reports the page unchanged.
+_PARSED: dict[tuple[str, str | None, tuple[str, ...]], list[tuple[str, str]]] = {}
+
 
 @dataclass(frozen=True)
 class _Target:
@@ -21,6 +42,16 @@ class _Target:
     source_label: str  # e.g., "lever:palantir"
 
 
+def _exclude_re(exclude: Sequence[str]) -> re.Pattern[str] | None:
+    """One case-insensitive alternation so the classification filter is a single C-level search."""
+    words = [w for w in exclude if w]
+    return re.compile("|".join(map(re.escape, words)), re.IGNORECASE) if words else None
+
+
+def _s(x: object) -> str:
+    return str(x).strip() if x is not None else ""
+
+
 def _normalize_targets(raw: object) -> list[_Target]:
     """
     Accept either:
@@ -28,20 +59,23 @@ def _normalize_targets(raw: object) -> list[_Target]:
       - [{"url": "...", "source": "lever:palantir"}, ...]
     and return a normalized list of _Target.
     """
+    if not raw or type(raw) is not list:
+        return []
     out: list[_Target] = []
-    if not raw:
-        return out
-    if isinstance(raw, list):
-        for item in raw:
-            if isinstance(item, (list, tuple)) and len(item) >= 2:
-                url, label = str(item[0]).strip(), str(item[1]).strip()
-                if url and label:
-                    out.append(_Target(url, label))
-            elif isinstance(item, dict):
-                url = str(item.get("url") or item.get("list_url") or "").strip()
-                label = str(item.get("source") or item.get("source_label") or "").strip()
-                if url and label:
-                    out.append(_Target(url, label))
+    app = out.append
+    for item in raw:
+        t = type(item)
+        if t is list or t is tuple:
+            if len(item) < 2:
+                continue
+            url, label = _s(item[0]), _s(item[1])
+        elif t is dict:
+            url = _s(item.get("url") or item.get("list_url"))
+            label = _s(item.get("source") or item.get("source_label"))
+        else:
+            continue
+        if url and label:
+            app(_Target(url, label))
     return out
 
 
@@ -58,7 +92,7 @@ class LeverScraper(BaseScraper):
           ]
           or [{"url":"...","source":"lever:palantir"}, ...]
 
-      delay_seconds: float   # polite pause between tenants (default 3.0)
+      delay_seconds: float   # polite pause between fetches to the same host (default 3.0)
       query: str | null      # optional substring filter on title (case-insensitive)
       exclude: list[str]     # substrings to filter out of classification (default:
                              # ["on-site", "onsite", "internship"])
@@ -84,9 +118,10 @@ class LeverScraper(BaseScraper):
         results: list[ScrapeResult] = []
         if skip_network:
             return results
+        person_env = sys.intern(person_env)
 
         for spec in specs:
-            params = dict(spec.params or {})
+            params = spec.params or EMPTY_PARAMS
 
             targets = _normalize_targets(params.get("start_urls"))
             if not targets:
@@ -101,18 +136,25 @@ class LeverScraper(BaseScraper):
             exclude = [str(x).lower() for x in exclude_raw]
 
             # Iterate *tenants* inside this ScraperConfig, producing per-tenant results.
-            for idx, tgt in enumerate(targets):
-                if idx > 0 and delay > 0:
-                    time.sleep(delay)
+            for tgt in targets:
+                # Per-host pacing: the next fetch to this host waits `delay` from now
+                wait_for_host(tgt.list_url)
+                defer_host(tgt.list_url, delay)
 
                 items: list[Posting] = []
                 errs: list[str] = []
                 try:
-                    html = self._client.get_text(tgt.list_url)
-                    for title, url in self._parse_list_page(html, query=query, exclude=exclude):
+                    html, unchanged = self._client.get_text_cached(tgt.list_url, cache_path=self.http_cache_path)
+                    key = (tgt.list_url, query, tuple(exclude))
+                    parsed = _PARSED.get(key) if unchanged else None
+                    if parsed is None:
+                        parsed = self._parse_list_page(html, query=query, exclude=exclude)
+                        _PARSED[key] = parsed
+                    source_label = sys.intern(tgt.source_label)
+                    for title, url in parsed:
                         items.append(
                             Posting(
-                                source=tgt.source_label,  # per-tenant label
+                                source=source_label,  # per-tenant label
                                 person_env=person_env,
                                 title=title,
                                 url=url,
@@ -143,27 +185,59 @@ class LeverScraper(BaseScraper):
         """
         Return list[(title, url)] from a Lever 'list' page, applying filters.
         """
-        soup = BeautifulSoup(html, "html5lib")
+        exclude_re = _exclude_re(exclude)
         out: list[tuple[str, str]] = []
+        for href, title, classification in self._iter_postings(html):
+            url = urljoin(self._LEVER_BASE, href) if href else ""
 
-        for group in soup.select("div.postings-group"):
-            for a in group.select("a.posting-title"):
-                href = (a.get("href") or "").strip()
-                url = urljoin(self._LEVER_BASE, href) if href else ""
+            if not title or not url:
+                continue
+            if query and query.lower() not in title.lower():
+                continue
 
-                title_el = a.select_one('h5[data-qa="posting-name"]')
-                title = (title_el.get_text(strip=True) if title_el else "").strip()
+            # Classification text — used only for filtering
+            if exclude_re and classification and exclude_re.search(classification):
+                continue
 
-                if not title or not url:
-                    continue
-                if query and query.lower() not in title.lower():
-                    continue
+            out.append((title, url))
+        return out
 
-                # Classification text — used only for filtering
+    @staticmethod
+    def _iter_postings(html: str) -> Iterable[tuple[str, str, str]]:
+        """
+        Yield raw (href, title, classification) triples from a Lever 'list' page.
+        Text is whitespace-normalized the same way BS4's get_text(strip=True) does.
+        """
+        if _POSTING_LINKS_XP is None:
+            yield from LeverScraper._iter_postings_bs4(html)
+            return
+
+        if not html or not html.strip():
+            return
+        try:
+            doc = lxml.html.fromstring(html)
+        except ValueError:
+            # lxml refuses str input that carries an <?xml ... encoding=...?> declaration
+            yield from LeverScraper._iter_postings_bs4(html)
+            return
+        for a in _POSTING_LINKS_XP(doc):
+            title_els = _TITLE_XP(a)
+            cat_els = _CATEGORIES_XP(a)
+            title = "".join(t.strip() for t in title_els[0].itertext()) if title_els else ""
+            cat_parts = (t.strip() for t in cat_els[0].itertext()) if cat_els else ()
+            classification = " ".join(t for t in cat_parts if t)
+            yield (a.get("href") or "").strip(), title, classification
+
+    @staticmethod
+    def _iter_postings_bs4(html: str) -> Iterable[tuple[str, str, str]]:
+        """BS4/html5lib variant of _iter_postings (no lxml, or markup lxml rejects)."""
+        soup = BeautifulSoup(html, "html5lib")
+        for group in soup.select("div.postings-group"):
+            for a in group.select("a.posting-title"):
+                title_el = a.select_one('h5[data-qa="posting-name"]')
                 cat_el = a.select_one("div.posting-categories")
-                classification = (cat_el.get_text(" ", strip=True) if cat_el else "").strip().lower()
-                if classification and any(ex in classification for ex in exclude):
-                    continue
-
-                out.append((title, url))
-        return out
+                yield (
+                    (a.get("href") or "").strip(),
+                    title_el.get_text(strip=True) if title_el else "",
+                    cat_el.get_text(" ", strip=True) if cat_el else "",
+                )
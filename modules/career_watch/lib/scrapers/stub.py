@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import sys
+from collections.abc import Mapping
 from typing import Any
 
-from ..config import ScraperConfig
+from ..config import EMPTY_PARAMS, ScraperConfig
 from ..models import Posting, ScrapeResult
 from .base import BaseScraper
 from .registry import register
@@ -34,9 +36,11 @@ class StubScraper(BaseScraper):
         skip_network: bool,
     ) -> list[ScrapeResult]:
         results: list[ScrapeResult] = []
+        person_env = sys.intern(person_env)
 
         for spec in specs:
-            params: dict[str, Any] = dict(spec.params or {})
+            source = sys.intern(spec.source)
+            params: Mapping[str, Any] = spec.params or EMPTY_PARAMS
             raw_items = params.get("items") or []
             if not isinstance(raw_items, list):
                 raw_items = []
@@ -51,7 +55,7 @@ class StubScraper(BaseScraper):
                     continue  # URL is required to be meaningful
                 postings.append(
                     Posting(
-                        source=spec.source,
+                        source=source,
                         person_env=person_env,
                         title=title or "(no title)",
                         url=url,
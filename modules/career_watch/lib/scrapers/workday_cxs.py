@@ -6,12 +6,13 @@ import json
 import logging
 import os
 import re
-import time
+import sys
 from typing import Any
 from urllib.parse import parse_qs, urlsplit
 
-from ..config import ScraperConfig
-from ..http_client import HttpClient
+from .. import db
+from ..config import EMPTY_PARAMS, ScraperConfig
+from ..http_client import HttpClient, body_digest, defer_host, wait_for_host
 from ..models import Posting, ScrapeResult
 from .base import BaseScraper
 from .registry import register
@@ -20,6 +21,10 @@ log = logging.getLogger(__name__)
 
 _LOCALE_RE = re.compile(r"^[a-z]{2}-[A-Z]{2}$")
 
+# http_cache key -> (title, url) pairs collected across all pages on the last run.
+# Reused (skipping pagination) when the first page hashes the same as last time.
+_PAGES: dict[str, list[tuple[str, str]]] = {}
+
 
 def _infer_cxs_from_list_url(list_url: str) -> str | None:
     """
@@ -46,6 +51,10 @@ def _infer_cxs_from_list_url(list_url: str) -> str | None:
         return None
 
 
+def _s(x: object) -> str:
+    return str(x).strip() if x is not None else ""
+
+
 def _deepcopy_jsonable(obj: Any) -> Any:
     return json.loads(json.dumps(obj))
 
@@ -101,7 +110,7 @@ class WorkdayCxSScraper(BaseScraper):
         - or {"url": "...", "source": "...", "payload": { ... }}
         - or ["<normal_list_url>", "workday:<label>"] and we will infer cxs url
 
-      delay_seconds: float (default 4.0)
+      delay_seconds: float (default 4.0) -> min gap between requests to the same host
       limit: int (default 20)       -> payload["limit"]
       max_pages: int (default 3)    -> paginate via offset
       base_payload: dict (optional) -> merged into each payload before paging
@@ -147,11 +156,12 @@ class WorkdayCxSScraper(BaseScraper):
     ) -> list[ScrapeResult]:
         if skip_network:
             return []
+        person_env = sys.intern(person_env)
 
         results: list[ScrapeResult] = []
 
         for spec in specs:
-            params = dict(spec.params or {})
+            params = spec.params or EMPTY_PARAMS
             delay = float(params.get("delay_seconds") or 4.0)
             limit = int(params.get("limit") or 20)
             max_pages = int(params.get("max_pages") or 3)
@@ -160,15 +170,19 @@ class WorkdayCxSScraper(BaseScraper):
             raw_targets = params.get("start_targets") or params.get("start_urls") or []
             targets: list[tuple[str, str, dict[str, Any]]] = []
 
+            default_src = spec.source or self.SOURCE
             for item in raw_targets:
-                if isinstance(item, (list, tuple)):
+                t = type(item)
+                if t is list or t is tuple:
                     # ["list or cxs url", "source", payload?]
-                    url = str(item[0]).strip()
-                    src = str(item[1]).strip() if len(item) >= 2 else (spec.source or self.SOURCE)
-                    payload = dict(item[2]) if len(item) >= 3 and isinstance(item[2], dict) else {}
-                elif isinstance(item, dict):
-                    url = str(item.get("url") or item.get("cxs_url") or item.get("list_url") or "").strip()
-                    src = str(item.get("source") or item.get("source_label") or spec.source or self.SOURCE).strip()
+                    raw_url = item[0]
+                    url = _s(raw_url)
+                    src = _s(item[1]) if len(item) >= 2 else default_src
+                    payload = dict(item[2]) if len(item) >= 3 and type(item[2]) is dict else {}
+                elif t is dict:
+                    raw_url = item.get("url") or item.get("list_url")
+                    url = _s(item.get("url") or item.get("cxs_url") or item.get("list_url"))
+                    src = _s(item.get("source") or item.get("source_label") or default_src)
                     payload = dict(item.get("payload") or {})
                 else:
                     continue
@@ -181,23 +195,17 @@ class WorkdayCxSScraper(BaseScraper):
                 if not url:
                     continue
 
-                payload = _merge_query_into_payload(
-                    (
-                        item[0]
-                        if isinstance(item, (list, tuple))
-                        else (item.get("url") or item.get("list_url") or url)
-                    ),
-                    payload,
-                )
-                targets.append((url, src, payload))
-
-            for ti, (cxs_url, source_label, payload_in) in enumerate(targets):
-                if ti and delay:
-                    time.sleep(delay)
+                payload = _merge_query_into_payload(raw_url or url, payload)
+                targets.append((url, sys.intern(src), payload))
 
+            for cxs_url, source_label, payload_in in targets:
                 items: list[Posting] = []
                 errors: list[str] = []
 
+                cache_key: str | None = None
+                first_sha = ""
+                reused = False
+
                 offset = 0
                 for page in range(max_pages):
                     try:
@@ -213,8 +221,26 @@ class WorkdayCxSScraper(BaseScraper):
                             except Exception:
                                 pass
 
+                        # Per-host pacing: tenants on other hosts don't wait on this one
+                        wait_for_host(cxs_url)
+                        defer_host(cxs_url, delay)
                         r = self._client.session.post(cxs_url, json=payload, timeout=self._client.timeout)
                         r.raise_for_status()
+
+                        if page == 0 and self.http_cache_path:
+                            payload_sha = body_digest(json.dumps(payload, sort_keys=True).encode())
+                            cache_key = f"POST {cxs_url} {payload_sha}"
+                            first_sha = body_digest(r.content)
+                            prev = _PAGES.get(cache_key)
+                            cached = db.http_cache_get(self.http_cache_path, cache_key)
+                            if prev is not None and cached and cached[2] == first_sha:
+                                items.extend(
+                                    Posting(source=source_label, person_env=person_env, title=t, url=u)
+                                    for t, u in prev
+                                )
+                                reused = True
+                                break
+
                         data = r.json()
 
                         jobs = self._extract_jobs(data)
@@ -241,12 +267,21 @@ class WorkdayCxSScraper(BaseScraper):
                         if len(jobs) < limit:
                             break
                         offset += len(jobs)
-                        if delay:
-                            time.sleep(delay)
                     except Exception as e:
                         errors.append(f"{source_label}: page {page + 1}: {e!r}")
                         break
 
+                if cache_key and not reused and not errors:
+                    _PAGES[cache_key] = [(p.title, p.url) for p in items]
+                    with contextlib.suppress(Exception):
+                        db.http_cache_put(
+                            self.http_cache_path or "",
+                            cache_key,
+                            etag=None,
+                            last_modified=None,
+                            body_sha256=first_sha,
+                        )
+
                 results.append(ScrapeResult(source=source_label, items=items, errors=errors))
 
         return results
@@ -261,9 +296,11 @@ class WorkdayCxSScraper(BaseScraper):
           { body: { jobPostings: [...] } }
         """
         if isinstance(data, dict):
-            if isinstance(data.get("jobPostings"), list):
-                return [x for x in data["jobPostings"] if isinstance(x, dict)]
-            b = data.get("body")
-            if isinstance(b, dict) and isinstance(b.get("jobPostings"), list):
-                return [x for x in b["jobPostings"] if isinstance(x, dict)]
+            jp = data.get("jobPostings")
+            if not isinstance(jp, list):
+                b = data.get("body")
+                jp = b.get("jobPostings") if isinstance(b, dict) else None
+            if isinstance(jp, list):
+                # Check every item: a dict first does not make the rest dicts
+                return [x for x in jp if isinstance(x, dict)]
         return []
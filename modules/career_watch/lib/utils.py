@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import html
 import os
+import time
 from datetime import datetime, timezone
 from typing import Any, Optional
 
@@ -32,11 +33,23 @@ def truthy(v: Any) -> bool:
     return s in {"1", "true", "yes", "on", "y", "t"}
 
 
+# (epoch second, formatted string) of the last now_iso() call
+_LAST_ISO: tuple[int, str] = (-1, "")
+
+
 def now_iso() -> str:
     """
-    UTC ISO-8601 timestamp with 'Z' suffix.
-    """
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    UTC ISO-8601 timestamp (second precision) with 'Z' suffix.
+    Cached per clock second so bursts of calls reuse the same string.
+    """
+    global _LAST_ISO
+    ti = int(time.time())
+    last = _LAST_ISO
+    if last[0] == ti:
+        return last[1]
+    s = datetime.fromtimestamp(ti, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    _LAST_ISO = (ti, s)
+    return s
 
 
 def getenv_str(name: str, default: str | None = None) -> str | None:
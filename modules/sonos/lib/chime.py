@@ -17,6 +17,7 @@ def run_chime(
     *,
     play_volume: int | None = None,  # <-- exact volume for chime playback
     fade_restore: bool = False,
+    capture_invariants: bool = False,
 ) -> dict[str, Any]:
     """
     Core chime logic:
@@ -40,6 +41,7 @@ def run_chime(
         play_volume=play_volume,
         wait_seconds=wait_seconds,
         fade_restore=fade_restore,
+        capture_invariants=capture_invariants,
     )
 
 
@@ -50,6 +52,7 @@ def run_action(**kwargs) -> dict[str, Any]:
     Expected kwargs (already-resolved values):
       - sonos_volume:       optional int (0..100) exact playback volume for the chime.
       - action:             optional, defaults to "chime" (ignored otherwise).
+      - debug:              optional bool; also report queue/URI before+after (extra SOAP calls).
 
     No other kwargs are used in this path.
     """
@@ -67,4 +70,5 @@ def run_action(**kwargs) -> dict[str, Any]:
     return run_chime(
         play_volume=play_volume,
         fade_restore=False,
+        capture_invariants=str(kwargs.get("debug", "")).strip().lower() in {"1", "true", "yes", "on"},
     )
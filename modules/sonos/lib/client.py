@@ -2,9 +2,46 @@
 from __future__ import annotations
 
 import contextlib
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-from soco import SoCo
+import requests
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:  # SoCo pulls in its whole network stack; import it only when connecting
+    from soco import SoCo
+
+# SoCo issues every SOAP command via module-level requests.post(), i.e. a fresh TCP
+# connection per call. Route those through one keep-alive Session instead.
+_SESSION: requests.Session | None = None
+
+
+class _SessionRequests:
+    """Stand-in for the `requests` module inside soco.services, backed by one Session."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(requests, name)  # exceptions, codes, ...
+
+    def __init__(self, session: requests.Session):
+        self._session = session
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self._session.post(url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self._session.get(url, **kwargs)
+
+
+def _install_keepalive_session() -> None:
+    global _SESSION
+    import soco.services
+
+    if isinstance(soco.services.requests, _SessionRequests):
+        return
+    if _SESSION is None:
+        _SESSION = requests.Session()
+        _SESSION.headers["Connection"] = "keep-alive"
+        _SESSION.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+    soco.services.requests = _SessionRequests(_SESSION)
 
 
 class SonosClient:
@@ -27,8 +64,11 @@ class SonosClient:
     # Connection
     # --------------------------------------------------------------------- #
     def _connect(self, ip: str) -> SoCo:
+        from soco import SoCo
+
+        _install_keepalive_session()
         try:
-            c = SoCo(ip)
+            c = SoCo(ip)  # SoCo instances are already singletons per IP
             _ = c.player_name  # validate connectivity early
             return c
         except Exception as e:
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 import contextlib
+import queue
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-from soco.snapshot import Snapshot
-
 from .client import SonosClient
 
 
@@ -27,6 +27,84 @@ def _safe_track_uri(c) -> str:
         return ""
 
 
+def _safe_invariants(client: SonosClient) -> tuple[int, str]:
+    """
+    Return (queue_size, track_uri). The two SOAP calls are independent, so issue
+    them concurrently: one round-trip of latency instead of two.
+    """
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        qsize = ex.submit(lambda: client.queue_size)
+        uri = ex.submit(_safe_track_uri, client.coord)
+        return qsize.result(), uri.result()
+
+
+def _subscribe_transport(c) -> Any | None:
+    """Subscribe to AVTransport events; None if eventing is unavailable (no listener, firewall, ...)."""
+    try:
+        return c.avTransport.subscribe(auto_renew=False)
+    except Exception:
+        return None
+
+
+def _next_event_state(sub, timeout: float) -> str | None:
+    """
+    Wait up to `timeout` for the next AVTransport event.
+    Returns its transport_state ("" if the event didn't carry one), or None on timeout.
+    """
+    try:
+        event = sub.events.get(timeout=timeout)
+    except queue.Empty:
+        return None
+    variables = getattr(event, "variables", None) or {}
+    return str(variables.get("transport_state", "")).strip()
+
+
+def _drain_events(sub) -> None:
+    """Discard events already queued (e.g. GENA's initial NOTIFY with the pre-chime state)."""
+    with contextlib.suppress(queue.Empty, AttributeError):
+        while True:
+            sub.events.get_nowait()
+
+
+def _wait_for_playback_end(c, deadline: float, sub) -> tuple[bool, bool]:
+    """
+    Block until playback has started and then left PLAYING, or until `deadline`.
+    Returns (saw_playing, finished); finished is False when the deadline ran out first.
+
+    With an event subscription, state changes are pushed to us and polling is only
+    a slow safety net; without one, poll with exponential backoff (50 ms -> 500 ms).
+
+    An evented PLAYING only counts once a non-PLAYING event (TRANSITIONING, ...) has
+    been seen: the subscription's initial NOTIFY can land late and still report the
+    music that was playing before the chime. Polled states are always current.
+    """
+    saw_playing = False
+    armed = False
+    delay = 0.05
+    max_delay = 2.0 if sub is not None else 0.5
+    while (remaining := deadline - time.monotonic()) > 0:
+        wait = min(delay, remaining)
+        state = _next_event_state(sub, wait) if sub is not None else None
+        polled = state is None
+        if polled:
+            if sub is None:
+                time.sleep(wait)
+            state = _safe_transport_state(c)
+            delay = min(max_delay, delay * 1.5)
+        elif not state:
+            continue  # event without a transport_state change
+
+        if state.upper() == "PLAYING":
+            if polled or armed:
+                saw_playing = True
+        elif saw_playing:
+            # finished (or left PLAYING)
+            return True, True
+        elif not polled:
+            armed = True
+    return saw_playing, False
+
+
 def play_uri_with_snapshot(
     client: SonosClient,
     *,
@@ -35,6 +113,7 @@ def play_uri_with_snapshot(
     play_volume: int | None = None,  # exact volume for chime playback
     wait_seconds: float = 5.0,  # overall timeout while polling
     fade_restore: bool = False,
+    capture_invariants: bool = False,  # read queue size / track URI before+after (4 extra SOAP calls)
 ) -> dict[str, Any]:
     """
     Play a direct URI (does not touch the queue), preserving the user's session via SoCo Snapshot.
@@ -43,12 +122,16 @@ def play_uri_with_snapshot(
       1) Take Snapshot of the coordinator (captures queue + position context).
       2) Optionally set an exact playback volume (remember previous volume).
       3) Play the URI.
-      4) Poll transport_state until it has played and then finished OR until wait_seconds timeout.
+      4) Watch transport_state (AVTransport events, else backoff polling) until it has played
+         and then finished OR until wait_seconds timeout.
       5) Restore snapshot (no assertions on transport transitions).
       6) Restore previous volume.
 
-    Returns a small summary dict suitable for logs/metrics.
+    Returns a small summary dict suitable for logs/metrics. The queue/URI round-trip
+    fields are None unless capture_invariants=True.
     """
+    from soco.snapshot import Snapshot
+
     c = client.coord
 
     # Best-effort skip if TV input is active (Sonos cannot pause TV cleanly)
@@ -59,8 +142,10 @@ def play_uri_with_snapshot(
         pass
 
     # Baseline for invariants / debug
-    before_qsize = client.queue_size
-    before_uri = _safe_track_uri(c)
+    before_qsize: int | None = None
+    before_uri: str | None = None
+    if capture_invariants:
+        before_qsize, before_uri = _safe_invariants(client)
 
     # 1) Snapshot (queue + position context)
     snap = Snapshot(c)
@@ -76,24 +161,25 @@ def play_uri_with_snapshot(
         with contextlib.suppress(Exception):
             c.volume = max(0, min(100, int(play_volume)))
 
-    # 3) Fire the alert
-    c.play_uri(uri=uri, title=title or "")
-
-    # 4) Poll for completion up to timeout
-    # Strategy:
-    #   - Wait until we observe PLAYING at least once (so playback actually began)
-    #   - After that, break when it is no longer PLAYING
-    #   - Stop trying altogether once wait_seconds has elapsed
-    deadline = time.monotonic() + max(0.0, float(wait_seconds))
-    saw_playing = False
-    while time.monotonic() < deadline:
-        state = _safe_transport_state(c)
-        if state.upper() == "PLAYING":
-            saw_playing = True
-        elif saw_playing and state.upper() != "PLAYING":
-            # finished (or left PLAYING)
-            break
-        time.sleep(0.25)
+    # Subscribe before playing so the PLAYING transition isn't missed
+    sub = _subscribe_transport(c)
+    try:
+        if sub is not None:
+            _drain_events(sub)
+        # 3) Fire the alert
+        c.play_uri(uri=uri, title=title or "")
+
+        # 4) Wait for completion up to timeout
+        # Strategy:
+        #   - Wait until we observe PLAYING at least once (so playback actually began)
+        #   - After that, stop when it is no longer PLAYING
+        #   - Stop trying altogether once wait_seconds has elapsed
+        deadline = time.monotonic() + max(0.0, float(wait_seconds))
+        saw_playing, finished = _wait_for_playback_end(c, deadline, sub)
+    finally:
+        if sub is not None:
+            with contextlib.suppress(Exception):
+                sub.unsubscribe()
 
     # 5) Restore snapshot (queue and playback context)
     snap.restore(fade=fade_restore)
@@ -104,15 +190,17 @@ def play_uri_with_snapshot(
             c.volume = prev_vol
 
     # After-state for invariants / debug
-    after_qsize = client.queue_size
-    after_uri = _safe_track_uri(c)
+    after_qsize: int | None = None
+    after_uri: str | None = None
+    if capture_invariants:
+        after_qsize, after_uri = _safe_invariants(client)
 
     return {
         "queue_size": {"before": before_qsize, "after": after_qsize},
-        "uri_roundtrip_equal": bool(before_uri and (before_uri == after_uri)),
+        "uri_roundtrip_equal": bool(before_uri and (before_uri == after_uri)) if capture_invariants else None,
         "before_uri": before_uri,
         "after_uri": after_uri,
         "saw_playing": saw_playing,
-        "timed_out": time.monotonic() >= deadline
-        and (not saw_playing or _safe_transport_state(c).upper() == "PLAYING"),
+        # From what the wait loop observed; no extra SOAP call after playback
+        "timed_out": not finished,
     }
@@ -17,9 +17,12 @@ def getenv_str(name: str, default: str | None = None) -> str | None:
 
 
 def require(value: str | None, *, error: str) -> str:
-    if value is None or not str(value).strip():
+    if value is None:
         raise RuntimeError(error)
-    return str(value).strip()
+    s = str(value).strip()
+    if not s:
+        raise RuntimeError(error)
+    return s
 
 
 def require_env(env_name: str) -> str:
@@ -37,7 +40,7 @@ def build_file_url(nas_ip: str, path: str) -> str:
 
 
 def hour_12_now_str2() -> str:
-    h = int(datetime.now().strftime("%I"))  # 01..12
+    h = datetime.now().hour % 12 or 12  # 01..12
     return f"{h:02d}"
 
 
@@ -10,6 +10,7 @@ def run(**kwargs: Any) -> tuple[str, dict] | None:
     Entry for modules.sonos.
     Kwargs:
       action: "chime" (default)
+      debug: bool (optional) -> include queue/URI invariants in the result
     """
     action = str(kwargs.pop("action", "chime")).lower()
     if action in ("chime", ""):
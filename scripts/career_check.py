@@ -3,25 +3,37 @@
 summarize_new_postings.py — Robust, timezone-safe summary of new career postings.
 
 Preserves original logic exactly, with all improvements applied.
+
+Activity logs are JSONL (one record per line), so each line is decoded on its own;
+there is no streaming/incremental parser path.
 """
 
 import argparse
+import asyncio
+import functools
+import io
+import itertools
 import json
+import os
+import re
 import sys
-from collections import namedtuple
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TextIO
 
-# Try to use ijson for large files; fallback to json
+# Activity logs are JSONL: decode line-by-line, with orjson (C) when available
 try:
-    import ijson  # type: ignore
+    import orjson  # type: ignore
 
-    USE_IJSON = True
+    _loads = orjson.loads
 except ImportError:
-    USE_IJSON = False
+    _loads = json.loads
 
 
 # ----------------------------------------------------------------------
+# sources: tuple[(raw_label, pretty_name), ...]; main() shares equal pairs across events
 NewPosting = namedtuple(
     "NewPosting",
     ["timestamp", "person", "sources", "count", "run_id", "log_file"],
@@ -29,16 +41,45 @@ NewPosting = namedtuple(
 
 
 # ----------------------------------------------------------------------
+# UTC shapes our logs actually write: ...Z, ...+00:00, or naive
+_ISO_UTC_RE = re.compile(
+    r"^(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6})\d*)?(?:Z|[+-]00:?00)?$"
+)
+
+
 def parse_iso(ts: str | None) -> datetime | None:
     """Parse ISO-8601 string to timezone-aware UTC datetime."""
     if not ts:
         return None
-    ts = ts.strip()
+    return _parse_iso_cached(ts.strip())
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_iso_cached(ts: str) -> datetime | None:
+    # Fast path: build the UTC datetime straight from the regex groups
+    m = _ISO_UTC_RE.match(ts)
+    if m:
+        y, mo, d, h, mi, sec, frac = m.groups()
+        try:
+            return datetime(
+                int(y),
+                int(mo),
+                int(d),
+                int(h),
+                int(mi),
+                int(sec),
+                int(frac.ljust(6, "0")) if frac else 0,
+                tzinfo=timezone.utc,
+            )
+        except ValueError:
+            return None
 
     if ts.endswith("Z"):
         ts = ts[:-1] + "+00:00"
-    if "T" not in ts and " " in ts.split(maxsplit=1)[0]:
-        ts = ts.replace(" ", "T", 1)
+    # "YYYY-MM-DD HH:MM:SS" -> "YYYY-MM-DDTHH:MM:SS" (index checks, no split/list allocation)
+    s_idx = ts.find(" ")
+    if s_idx >= 0 and ts.find("T") == -1:
+        ts = ts[:s_idx] + "T" + ts[s_idx + 1 :]
 
     try:
         dt = datetime.fromisoformat(ts)
@@ -49,8 +90,14 @@ def parse_iso(ts: str | None) -> datetime | None:
     return dt
 
 
+@functools.lru_cache(maxsize=1024)
+def _pretty(src: str) -> str:
+    """Display name for a source label: "lever:acme" -> "acme"."""
+    return src.rsplit(":", 1)[-1]
+
+
 # ----------------------------------------------------------------------
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Summarize new career postings from activity logs",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
@@ -66,12 +113,30 @@ def parse_args() -> argparse.Namespace:
         default=["Test User", "The Archivist", "Sidekick"],
         help="Usernames to exclude from summary",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--since",
+        type=str,
+        default=None,
+        help="Only report runs at/after this ISO-8601 time; older log files are not opened",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Overlap file reads with asyncio threads (helps on network-mounted log dirs)",
+    )
+    return parser.parse_args(argv)
 
 
 # ----------------------------------------------------------------------
-def main() -> None:
-    args = parse_args()
+def main(argv: list[str] | None = None, out: TextIO | None = None, err: TextIO | None = None) -> None:
+    """
+    Print the report to ``out`` (default stdout) and errors to ``err`` (default stderr).
+    Explicit streams let a host process capture one run without redirecting sys.stdout.
+    """
+    out = out or sys.stdout
+    err = err or sys.stderr
+    args = parse_args(argv)
 
     # Resolve log directory
     script_dir = Path(__file__).resolve().parent
@@ -79,100 +144,152 @@ def main() -> None:
     log_dir = log_dir.resolve()
 
     if not log_dir.is_dir():
-        print(f"Error: Log directory not found: {log_dir}", file=sys.stderr)
+        print(f"Error: Log directory not found: {log_dir}", file=err)
         sys.exit(1)
 
-    log_files = sorted(log_dir.glob("activity-*"))
+    since: datetime | None = None
+    if args.since:
+        since = parse_iso(args.since)
+        if since is None:
+            print(f"Error: --since is not an ISO-8601 timestamp: {args.since!r}", file=err)
+            sys.exit(2)
+
+    # Newest first; with --since, files last written before the cutoff hold nothing relevant
+    stamped = [(p.stat().st_mtime, p) for p in log_dir.glob("activity-*")]
+    stamped.sort(key=lambda sp: sp[0], reverse=True)
+    if since is not None:
+        since_epoch = since.timestamp()
+        stamped = [(m, p) for m, p in stamped if m >= since_epoch]
+    log_files = [p for _m, p in stamped]
     if not log_files:
-        print(f"No activity-* files found in {log_dir}")
+        suffix = f" modified since {args.since}" if since is not None else ""
+        print(f"No activity-* files found in {log_dir}{suffix}", file=out)
         return
 
-    print(f"Scanning {len(log_files)} log file(s) in {log_dir}...")
+    print(f"Scanning {len(log_files)} log file(s) in {log_dir}...", file=out)
 
     results: list[NewPosting] = []
     excluded: set[str] = set(args.exclude)
 
-    for log_file in log_files:
-        pending_summary: dict[str, object] | None = None
-
-        try:
-            if USE_IJSON:
-                with open(log_file, "rb") as f:
-                    for item in ijson.items(f, "", multiple_values=True):
-                        pending_summary = process_log_line(item, excluded, pending_summary, log_file, results)
-            else:
-                with open(log_file, encoding="utf-8") as f:
-                    for raw_line in f:
-                        line = raw_line.strip()
-                        if not line:
-                            continue
-                        try:
-                            data = json.loads(line)
-                        except json.JSONDecodeError:
-                            continue
-                        pending_summary = process_log_line(data, excluded, pending_summary, log_file, results)
-        except Exception as e:
-            print(f"Warning: Failed to read {log_file}: {e}", file=sys.stderr)
-
-        # EOF: flush any leftover summary
-        if pending_summary:
-            results.append(
-                NewPosting(
-                    timestamp=None,
-                    person=pending_summary["person"],
-                    sources=pending_summary["sources"],
-                    count=pending_summary["count"],
-                    run_id=pending_summary.get("run_id"),
-                    log_file=log_file.name,
-                )
-            )
+    # Files are independent, so parse them in parallel (CPU-bound JSON decode)
+    if args.use_async:
+        for file_results in asyncio.run(_scan_files_async(log_files, excluded, err)):
+            results.extend(file_results)
+    elif len(log_files) > 1:
+        workers = min(8, len(log_files), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            for file_results, warnings in ex.map(_scan_file_in_worker, log_files, itertools.repeat(excluded)):
+                results.extend(file_results)
+                err.write(warnings)
+    else:
+        for log_file in log_files:
+            results.extend(_scan_file(log_file, excluded, err))
+
+    # Source labels repeat across thousands of events; keep one object per (label, name).
+    # Done here, not in _scan_file: pool results are unpickled into fresh strings anyway.
+    interned: dict[tuple[str, str], tuple[str, str]] = {}
+    keep = interned.setdefault
+    results = [r._replace(sources=tuple(keep(s, s) for s in r.sources)) for r in results]
+
+    if since is not None:
+        # Logs are append-only, so older runs can still sit in a recently touched file
+        results = [r for r in results if r.timestamp is None or r.timestamp >= since]
 
     if not results:
-        print("\nNo new postings found (excluding test users).")
+        print("\nNo new postings found (excluding test users).", file=out)
         return
 
     # Sort: known timestamps first
     results.sort(key=lambda x: (x.timestamp is None, x.timestamp))
 
     # ------------------------------------------------------------------
-    print("\n" + "=" * 80)
-    print("SUMMARY: NEW POSTINGS FOUND")
-    print("=" * 80)
+    print("\n" + "=" * 80, file=out)
+    print("SUMMARY: NEW POSTINGS FOUND", file=out)
+    print("=" * 80, file=out)
 
     cur_date: str | None = None
     for e in results:
         if e.timestamp:
-            local_dt = e.timestamp.astimezone()
-            d_str = local_dt.strftime("%Y-%m-%d")
-            t_str = local_dt.strftime("%H:%M:%S")
+            # astimezone() per event (not a hoisted fixed offset) keeps DST right for older runs
+            d_str, t_str = e.timestamp.astimezone().strftime("%Y-%m-%d %H:%M:%S").split(" ", 1)
         else:
             d_str = "Unknown Date"
             t_str = "??:??:??"
 
         if d_str != cur_date:
-            print(f"\n[{d_str}]")
+            print(f"\n[{d_str}]", file=out)
             cur_date = d_str
 
-        # Pretty source list
+        # Pretty source list (Counter keeps first-seen order)
         src_parts = []
-        seen = set()
-        for src in e.sources:
-            if src in seen:
-                continue
-            seen.add(src)
-            cnt = e.sources.count(src)
-            name = src.split(":")[-1]
+        for (_src, name), cnt in Counter(e.sources).items():
             src_parts.append(f"{name} ({cnt})" if cnt > 1 else name)
         src_str = ", ".join(src_parts)
 
-        print(f"  {t_str} | {e.person:<20} | +{e.count} new | {src_str}")
+        print(f"  {t_str} | {e.person:<20} | +{e.count} new | {src_str}", file=out)
         if e.run_id:
-            print(f"{' ' * 12}| run_id: {e.run_id}")
-        print(f"{' ' * 12}| from: {e.log_file}")
+            print(f"{' ' * 12}| run_id: {e.run_id}", file=out)
+        print(f"{' ' * 12}| from: {e.log_file}", file=out)
+
+    print("\n" + "=" * 80, file=out)
+    print(f"Total events with new postings: {len(results)}", file=out)
+    print("=" * 80, file=out)
+
+
+# ----------------------------------------------------------------------
+def _scan_file(log_file: Path, excluded: set[str], err: TextIO | None = None) -> list[NewPosting]:
+    """Scan one activity log and return its NewPosting records; read failures are reported to ``err``."""
+    results: list[NewPosting] = []
+    pending_summary: dict[str, object] | None = None
+
+    try:
+        # Binary mode: both decoders take bytes and tolerate the trailing newline
+        with open(log_file, "rb") as f:
+            for raw_line in f:
+                # Blank lines: skip without raising (bytes.isspace allocates nothing)
+                if raw_line == b"\n" or raw_line.isspace():
+                    continue
+                try:
+                    data = _loads(raw_line)
+                except ValueError:  # orjson/json decode errors subclass it
+                    continue
+                if isinstance(data, dict):
+                    pending_summary = process_log_line(data, excluded, pending_summary, log_file, results)
+    except Exception as e:
+        print(f"Warning: Failed to read {log_file}: {e}", file=err or sys.stderr)
+
+    # EOF: flush any leftover summary
+    if pending_summary:
+        results.append(
+            NewPosting(
+                timestamp=None,
+                person=pending_summary["person"],
+                sources=pending_summary["sources"],
+                count=pending_summary["count"],
+                run_id=pending_summary.get("run_id"),
+                log_file=log_file.name,
+            )
+        )
+    return results
+
+
+def _scan_file_in_worker(log_file: Path, excluded: set[str]) -> tuple[list[NewPosting], str]:
+    """_scan_file for a pool process: streams do not pickle, so warnings come back as text."""
+    buf = io.StringIO()
+    return _scan_file(log_file, excluded, buf), buf.getvalue()
+
+
+async def _scan_files_async(
+    log_files: list[Path], excluded: set[str], err: TextIO | None = None, limit: int = 32
+) -> list[list[NewPosting]]:
+    """Scan files concurrently on worker threads; the semaphore caps open file descriptors."""
+    sem = asyncio.Semaphore(limit)
+
+    async def _one(log_file: Path) -> list[NewPosting]:
+        async with sem:
+            return await asyncio.to_thread(_scan_file, log_file, excluded, err)
 
-    print("\n" + "=" * 80)
-    print(f"Total events with new postings: {len(results)}")
-    print("=" * 80)
+    return await asyncio.gather(*(_one(f) for f in log_files))
 
 
 # ----------------------------------------------------------------------
@@ -219,7 +336,7 @@ def process_log_line(
 
         return {
             "person": data["person"],
-            "sources": list(new_by_source.keys()),
+            "sources": tuple((k, _pretty(k)) for k in new_by_source),
             "count": sum(new_by_source.values()),
             "run_id": data.get("run_id"),
         }
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import contextlib
 import glob
 import os
 import sqlite3
@@ -12,6 +13,20 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent  # ../scripts → project
 DB_DIR = PROJECT_ROOT / "local" / "state"
 DB_PATTERN = str(DB_DIR / "*.db")  # glob needs a string
 
+_LATEST_SQL = """
+    SELECT title, url, first_seen_utc
+    FROM postings
+    ORDER BY first_seen_utc DESC
+    LIMIT ?
+"""
+# Walks the first_seen index backwards instead of scan+sort; older DBs may lack the index
+_LATEST_SQL_INDEXED = """
+    SELECT title, url, first_seen_utc
+    FROM postings INDEXED BY idx_postings_first_seen
+    ORDER BY first_seen_utc DESC
+    LIMIT ?
+"""
+
 
 def get_db_files() -> list[str]:
     """Return list of .db files in the target directory."""
@@ -24,25 +39,16 @@ def get_latest_entries(db_path: str, limit: int = 15) -> list[tuple[str, str, st
     Returns list of (title, url, first_seen_utc)
     """
     try:
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-        conn.execute("PRAGMA journal_mode=WAL;")
-        conn.execute("PRAGMA synchronous=NORMAL;")
-        conn.execute("PRAGMA foreign_keys=ON;")
-
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT title, url, first_seen_utc
-            FROM postings
-            ORDER BY first_seen_utc DESC
-            LIMIT ?
-        """,
-            (limit,),
-        )
-
-        rows = cur.fetchall()
-        conn.close()
-        return rows
+        # Read-only: WAL/synchronous PRAGMAs can't be changed here and foreign_keys is moot for a SELECT
+        with contextlib.closing(
+            sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, isolation_level=None, check_same_thread=False)
+        ) as conn:
+            conn.execute("PRAGMA query_only=1;")
+            conn.execute("PRAGMA mmap_size=268435456;")  # 256MB; read pages without read() syscalls
+            try:
+                return conn.execute(_LATEST_SQL_INDEXED, (limit,)).fetchall()
+            except sqlite3.OperationalError:  # "no such index"
+                return conn.execute(_LATEST_SQL, (limit,)).fetchall()
     except Exception as e:
         print(f"Error reading {db_path}: {e}", file=sys.stderr)
         return []
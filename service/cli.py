@@ -19,11 +19,15 @@ list-jobs
 
 validate-config
     - Loads/validates config and returns nonzero on error
+
+--version
+    - Prints the installed package version (accepted anywhere before the subcommand)
 """
 
 from __future__ import annotations
 
 import argparse
+import importlib
 import json
 import logging
 import os
@@ -38,21 +42,34 @@ from datetime import datetime
 from types import SimpleNamespace
 from typing import Any
 
-from service import imap_listener as _imap
 from service import logging_utils as L
-from service import runner as _runner
-from service import scheduler as _scheduler
 
-try:
-    from service import config_schema as _config_schema
-except Exception as e:  # pragma: no cover
-    _config_schema = None  # type: ignore
-    _CONF_IMPORT_ERR = e
-else:
-    _CONF_IMPORT_ERR = None
+LOG = logging.getLogger("service.cli")
+
+_DIST_NAME = "scheduled-modules"
 
 
-LOG = logging.getLogger("service.cli")
+# ---------------------------- Lazy service imports ---------------------------
+# scheduler/imap_listener/runner pull in APScheduler, imaplib and the module
+# loader; import them only once the chosen subcommand actually needs them so
+# --help, list-jobs and validate-config start fast.
+_LAZY_MODULES: dict[str, Any] = {}
+
+
+def _lazy(name: str) -> Any:
+    """Import service.<name> on first use and cache the module."""
+    mod = _LAZY_MODULES.get(name)
+    if mod is None:
+        mod = _LAZY_MODULES[name] = importlib.import_module(f"service.{name}")
+    return mod
+
+
+def _config_schema() -> tuple[Any, Exception | None]:
+    """Return (config_schema module, None) or (None, import error)."""
+    try:
+        return _lazy("config_schema"), None
+    except Exception as e:  # pragma: no cover
+        return None, e
 
 
 # ----------------------------- Logging setup ---------------------------------
@@ -68,25 +85,34 @@ def _ensure_logging() -> None:
 
 
 # -------------------------- Utility / glue code ------------------------------
+# json.loads also accepts NaN / Infinity / -Infinity, so "N" and "I" start JSON values too
+_JSON_FIRST_CHARS = frozenset('{["tfnNI-0123456789')
+_DETAILS_MAX = 120  # list-jobs fallback column width
+
+
 def _parse_kv_pairs(pairs: Iterable[str]) -> dict[str, Any]:
     """
     Parse key=value strings into a dict.
-    - Values that look like JSON (true/false/null/number/object/array) are parsed.
+    - Values that look like JSON (true/false/null/number/NaN/Infinity/object/array) are parsed.
     - Otherwise keep as raw strings.
     """
     out: dict[str, Any] = {}
     for raw in pairs:
-        if "=" not in raw:
+        k, sep, v = raw.partition("=")
+        if not sep:
             raise argparse.ArgumentTypeError(f"--kwargs item must be key=value (got {raw!r})")
-        k, v = raw.split("=", 1)
         k = k.strip()
         v = v.strip()
         if not k:
             raise argparse.ArgumentTypeError(f"Invalid key in --kwargs item {raw!r}")
-        try:
-            # Try to JSON-decode the value (for numbers, bools, arrays, objects)
-            out[k] = json.loads(v)
-        except Exception:
+        # Only hand values that can start a JSON document to the decoder; plain
+        # strings would otherwise cost a raised JSONDecodeError each.
+        if v[:1] in _JSON_FIRST_CHARS:
+            try:
+                out[k] = json.loads(v)
+            except json.JSONDecodeError:
+                out[k] = v
+        else:
             out[k] = v
     return out
 
@@ -94,11 +120,12 @@ def _parse_kv_pairs(pairs: Iterable[str]) -> dict[str, Any]:
 @contextmanager
 def _env_overrides(env: dict[str, str]):
     """Temporarily set environment variables."""
-    old = {}
+    if not env:
+        yield
+        return
+    old = {k: os.environ.get(k) for k in env}
     try:
-        for k, v in env.items():
-            old[k] = os.environ.get(k)
-            os.environ[k] = v
+        os.environ.update(env)
         yield
     finally:
         for k, v in old.items():
@@ -111,15 +138,19 @@ def _env_overrides(env: dict[str, str]):
 def _print_table(rows: Iterable[tuple[str, str]], headers: tuple[str, str] = ("ID", "DETAILS")) -> None:
     """Very simple two-column table printer."""
     rows = list(rows)
-    w0 = max(len(headers[0]), *(len(r[0]) for r in rows)) if rows else len(headers[0])
-    w1 = max(len(headers[1]), *(len(r[1]) for r in rows)) if rows else len(headers[1])
+    w0 = max(len(headers[0]), max((len(r[0]) for r in rows), default=0))
+    w1 = max(len(headers[1]), max((len(r[1]) for r in rows), default=0))
     sep = f"+-{'-' * w0}-+-{'-' * w1}-+"
-    print(sep)
-    print(f"| {headers[0].ljust(w0)} | {headers[1].ljust(w1)} |")
-    print(sep)
-    for c0, c1 in rows:
-        print(f"| {c0.ljust(w0)} | {c1.ljust(w1)} |")
-    print(sep)
+    lines = [sep, f"| {headers[0].ljust(w0)} | {headers[1].ljust(w1)} |", sep]
+    lines.extend(f"| {c0.ljust(w0)} | {c1.ljust(w1)} |" for c0, c1 in rows)
+    lines.append(sep)
+    # One write for the whole table instead of a print() per line
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _clip(text: str, limit: int = _DETAILS_MAX) -> str:
+    """Truncate a table cell to `limit` characters, marking the cut with '...'."""
+    return text if len(text) <= limit else text[: limit - 3] + "..."
 
 
 def _extract_jobs_from_config(cfg: Any) -> Iterable[tuple[str, str]]:
@@ -137,8 +168,9 @@ def _extract_jobs_from_config(cfg: Any) -> Iterable[tuple[str, str]]:
     out = []
     for idx, j in enumerate(jobs):
         if isinstance(j, dict):
-            jid = str(j.get("id") or j.get("name") or idx)
-            desc = j.get("summary") or j.get("description") or j.get("cron") or json.dumps(j, default=str)
+            g = j.get
+            jid = str(g("id") or g("name") or idx)
+            desc = g("summary") or g("description") or g("cron") or _clip(repr(j))
         else:
             # Try attributes
             jid = str(getattr(j, "id", None) or getattr(j, "name", None) or idx)
@@ -146,7 +178,7 @@ def _extract_jobs_from_config(cfg: Any) -> Iterable[tuple[str, str]]:
                 getattr(j, "summary", None)
                 or getattr(j, "description", None)
                 or getattr(j, "cron", None)
-                or repr(j)
+                or _clip(repr(j))
             )
         out.append((jid, str(desc)))
     return out
@@ -154,13 +186,14 @@ def _extract_jobs_from_config(cfg: Any) -> Iterable[tuple[str, str]]:
 
 # ------------------------------ Subcommands ----------------------------------
 def cmd_validate_config(args: argparse.Namespace) -> int:
-    if _config_schema is None:
-        LOG.error("config_schema is not available: %s", _CONF_IMPORT_ERR)
+    config_schema, err = _config_schema()
+    if config_schema is None:
+        LOG.error("config_schema is not available: %s", err)
         return 2
     try:
         cfg = _load_config_with_optional_path(args.config)
         # Optional: call a validate() if provided
-        validate = getattr(_config_schema, "validate", None)
+        validate = getattr(config_schema, "validate", None)
         if callable(validate):
             validate(cfg)
         print("OK: configuration is valid.")
@@ -174,8 +207,9 @@ def cmd_validate_config(args: argparse.Namespace) -> int:
 
 
 def cmd_list_jobs(args: argparse.Namespace) -> int:
-    if _config_schema is None:
-        LOG.error("config_schema is not available: %s", _CONF_IMPORT_ERR)
+    config_schema, err = _config_schema()
+    if config_schema is None:
+        LOG.error("config_schema is not available: %s", err)
         return 2
     try:
         cfg = _load_config_with_optional_path(args.config)
@@ -193,8 +227,17 @@ def cmd_list_jobs(args: argparse.Namespace) -> int:
         return 1
 
 
+_LAST_ISO: tuple[int, str] = (-1, "")
+
+
 def _now_iso():
-    return datetime.now().astimezone().isoformat()
+    """Local ISO-8601 timestamp at second resolution, formatted once per clock second."""
+    global _LAST_ISO
+    t = int(time.time())
+    if t != _LAST_ISO[0]:
+        # astimezone() per new second (not a tzinfo cached at import) keeps DST changes correct
+        _LAST_ISO = (t, datetime.fromtimestamp(t).astimezone().isoformat())
+    return _LAST_ISO[1]
 
 
 def cmd_run(args: argparse.Namespace) -> int:
@@ -212,7 +255,7 @@ def cmd_run(args: argparse.Namespace) -> int:
 
     try:
         with _env_overrides(env):
-            html, run_id = _runner.run_module_once(
+            html, run_id = _lazy("runner").run_module_once(
                 module=args.module,
                 kwargs=kwargs,
                 send_email=not args.no_email,
@@ -278,17 +321,10 @@ def cmd_serve(args: argparse.Namespace) -> int:
         signal.signal(sig, _graceful_shutdown)
 
     try:
-        # Start scheduler: prefer start(config_path=...) if available
-        if args.config:
-            try:
-                running.sched = _scheduler.start(config_path=args.config)  # type: ignore
-            except TypeError:
-                running.sched = _scheduler.start()  # type: ignore
-        else:
-            running.sched = _scheduler.start()  # type: ignore
-        LOG.info("Scheduler started: %r", running.sched)
-
+        # Load once; the scheduler and the IMAP listener share this cfg
         cfg = _load_config_with_optional_path(args.config)
+        running.sched = _lazy("scheduler").start(cfg=cfg)
+        LOG.info("Scheduler started: %r", running.sched)
 
         def cfg_getter():
             return cfg
@@ -297,13 +333,12 @@ def cmd_serve(args: argparse.Namespace) -> int:
             return running.sched._scheduler  # Expose the scheduler instance
 
         # Start IMAP listener with cfg_getter
-        imap_handle = _imap.start(cfg_getter=cfg_getter, scheduler_getter=scheduler_getter)  # type: ignore
+        imap_handle = _lazy("imap_listener").start(cfg_getter=cfg_getter, scheduler_getter=scheduler_getter)  # type: ignore
         running.imap_thread = imap_handle  # controller with .stop()/.join()
         LOG.info("IMAP listener started: %r", running.imap_thread)
 
-        # Main wait loop (respond quickly to signals)
-        while not stop_event.is_set():
-            time.sleep(0.3)
+        # Block until a signal handler sets the event (lock waits are signal-interruptible on POSIX)
+        stop_event.wait()
 
         # On normal stop path, ensure components are stopped
         _safe_stop("scheduler", running.sched)
@@ -343,28 +378,32 @@ def _safe_stop(name: str, handle: Any) -> None:
 
 def _load_config_with_optional_path(path: str | None) -> Any:
     """Load config via config_schema.load_config(), optionally with a specific path."""
-    if _config_schema is None:
-        raise RuntimeError(f"config_schema unavailable: {_CONF_IMPORT_ERR}")
-    load_config = getattr(_config_schema, "load_config", None)
-    if not callable(load_config):
-        raise RuntimeError("config_schema.load_config() not found")
-
-    if path:
-        try:
-            return load_config(path)
-        except TypeError:
-            # Older signature without path support
-            os.environ["CONFIG_PATH"] = path
-            return load_config()
-    return load_config()
+    config_schema, err = _config_schema()
+    if config_schema is None:
+        raise RuntimeError(f"config_schema unavailable: {err}")
+    # Always pass the path explicitly; never write CONFIG_PATH back into the
+    # environment (racy against the IMAP thread reading config).
+    return config_schema.load_config(path or os.environ.get("CONFIG_PATH"))
 
 
 # ------------------------------- Argparse ------------------------------------
+class _VersionAction(argparse.Action):
+    """Like action="version", but the importlib.metadata lookup only runs when --version is given."""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help=None):
+        super().__init__(option_strings=option_strings, dest=dest, default=default, nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        print(f"{_DIST_NAME} {_version()}")
+        parser.exit()
+
+
 def _build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         prog="python -m service.cli",
         description="Service command-line tools",
     )
+    p.add_argument("--version", action=_VersionAction, help="Print the package version and exit.")
     p.add_argument(
         "--config",
         help="Path to config file (fallbacks to CONFIG_PATH env or module default).",
@@ -408,6 +447,15 @@ def _build_parser() -> argparse.ArgumentParser:
 
 
 # --------------------------------- Main --------------------------------------
+def _version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version(_DIST_NAME)
+    except PackageNotFoundError:
+        return "unknown"
+
+
 def main(argv: Iterable[str] | None = None) -> int:
     _ensure_logging()
     parser = _build_parser()
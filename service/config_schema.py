@@ -1,10 +1,12 @@
 # service/config_schema.py
 from __future__ import annotations
 
+import copy
 import json
 import logging
 import os
 import re
+import threading
 from dataclasses import dataclass
 from typing import Any
 
@@ -15,6 +17,25 @@ try:
 except Exception:  # pragma: no cover
     yaml = None  # YAML optional
 
+# Prefer the C parsers when present; both fall back to the pure-Python ones.
+try:
+    import orjson  # type: ignore
+
+    def _json_loads(data: bytes) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN/Infinity, which json.loads accepts; keep accepting those configs
+            return json.loads(data)
+
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+
+try:
+    from yaml import CSafeLoader as _YamlLoader  # type: ignore
+except ImportError:  # pragma: no cover
+    _YamlLoader = yaml.SafeLoader if yaml else None
+
 
 class ConfigError(ValueError):
     """Raised when the config is invalid."""
@@ -35,7 +56,27 @@ _EMAIL_ENV_FIELDS = {
     "email_bcc": "email_bcc_env",
 }
 _TRIGGER_FIELDS = ("cron", "interval", "date", "daily_time")
-_DAILY_TIME_RE = re.compile(r"^(\d{1,2}):(\d{2})$")
+_TRIGGER_FIELDS_SET = frozenset(_TRIGGER_FIELDS)
+_DAILY_TIME_RE = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*$")
+# Optional job fields coerced by _apply_top_level_defaults: bools, and ints with their allow_zero flag
+_BOOL_FIELDS = ("coalesce", "send_email")
+_INT_FIELDS = (("timeout_sec", True), ("max_instances", False), ("misfire_grace_time", True))
+_MISSING = object()
+# Job keys that _apply_top_level_defaults rewrites (env lookups, bool/int/list coercion)
+_NORMALIZED_FIELDS = frozenset((
+    *_EMAIL_ENV_FIELDS.values(),
+    *_EMAIL_FIELDS,
+    *_BOOL_FIELDS,
+    *(n for n, _ in _INT_FIELDS),
+))
+_TRUE_STRINGS = frozenset({"1", "true", "yes", "on"})
+_FALSE_STRINGS = frozenset({"0", "false", "no", "off"})
+
+# Parsed-file cache: path -> (mtime_ns, size, ino, parsed). The IMAP listener
+# reads config from its own thread, hence the lock. Callers always get a deep
+# copy because _apply_top_level_defaults/validate mutate the dict in place.
+_CFG_CACHE: dict[str, tuple[int, int, int, Any]] = {}
+_CFG_CACHE_LOCK = threading.Lock()
 
 
 def load_config(path: str | None = None) -> dict[str, Any]:
@@ -65,6 +106,22 @@ def load_config(path: str | None = None) -> dict[str, Any]:
     return cfg
 
 
+# id → job index for O(1) lookups (IMAP RUN), kept beside the config rather than in it.
+# Keyed on the identity of cfg["jobs"]; holding the list keeps that identity from being reused.
+_jobs_index: tuple[list[Any], dict[Any, dict[str, Any]]] | None = None
+
+
+def find_job(cfg: dict[str, Any], job_id: str) -> dict[str, Any] | None:
+    """Return the job with `job_id` (the first one on duplicate ids), or None."""
+    global _jobs_index
+    jobs = cfg.get("jobs") or []
+    hit = _jobs_index
+    if hit is None or hit[0] is not jobs:
+        hit = (jobs, {j.get("id"): j for j in reversed(jobs) if isinstance(j, dict)})
+        _jobs_index = hit
+    return hit[1].get(job_id)
+
+
 def validate(cfg: dict[str, Any]) -> None:
     """
     Validate the configuration. Raise ConfigError on any problem.
@@ -86,6 +143,7 @@ def validate(cfg: dict[str, Any]) -> None:
         raise ConfigError("'timezone' must be a string if provided.")
 
     seen_ids: set[str] = set()
+    seen_add = seen_ids.add
     for idx, job in enumerate(jobs):
         if not isinstance(job, dict):
             raise ConfigError(f"Job at index {idx} must be an object/dict.")
@@ -99,9 +157,11 @@ def validate(cfg: dict[str, Any]) -> None:
         job_id = _derive_job_id(job, idx)
         if not job_id:
             raise ConfigError(f"Job {idx}: could not derive a valid job id.")
-        if job_id in seen_ids:
+        # One hash op per job: a duplicate leaves the set size unchanged
+        before = len(seen_ids)
+        seen_add(job_id)
+        if len(seen_ids) == before:
             raise ConfigError(f"Duplicate job id '{job_id}'.")
-        seen_ids.add(job_id)
 
         # Exactly one trigger among cron | interval | date | daily_time
         # Trigger may be nested under "trigger": {...} or at job top-level.
@@ -109,7 +169,7 @@ def validate(cfg: dict[str, Any]) -> None:
         if "trigger" in job and not isinstance(trigger_container, dict):
             raise ConfigError(f"Job '{job_id}': 'trigger' must be an object when present.")
 
-        present_triggers = [k for k in _TRIGGER_FIELDS if k in trigger_container]
+        present_triggers = trigger_container.keys() & _TRIGGER_FIELDS_SET
         # Guard against mixed usage (nested + top-level simultaneously)
         if "trigger" in job:
             also_top_level = [k for k in _TRIGGER_FIELDS if k in job and k != "trigger"]
@@ -122,7 +182,7 @@ def validate(cfg: dict[str, Any]) -> None:
             raise ConfigError(f"Job '{job_id}': exactly one trigger required among {', '.join(_TRIGGER_FIELDS)}.")
 
         # Light type checks for common mistakes
-        trig_key = present_triggers[0]
+        (trig_key,) = present_triggers
         trig_val = trigger_container[trig_key]
         if trig_key == "interval" and not isinstance(trig_val, dict):
             raise ConfigError(f"Job '{job_id}': interval must be an object of time kwargs.")
@@ -190,10 +250,17 @@ def _apply_top_level_defaults(cfg: dict[str, Any]) -> None:
         if not isinstance(job, dict):
             raise ConfigError(f"Job at index {idx} must be an object/dict.")
 
+        # Copy-on-write: jobs that already carry a clean id and none of the
+        # normalized fields are passed through untouched.
+        job_id = _derive_job_id(job, idx)
+        if job.get("id") == job_id and _NORMALIZED_FIELDS.isdisjoint(job):
+            normalized_jobs.append(job)
+            continue
+
         job_copy = dict(job)  # shallow copy
 
         # Derive id and set it (so scheduler can rely on it)
-        job_copy["id"] = _derive_job_id(job_copy, idx)
+        job_copy["id"] = job_id
 
         # ──────────────────────────────────────────────────────────────
         #  Resolve email_*_env → email_*  AND hide the secret name
@@ -203,20 +270,22 @@ def _apply_top_level_defaults(cfg: dict[str, Any]) -> None:
                 raw = job_copy[env_key]
                 if isinstance(raw, str):
                     value = os.getenv(raw.strip(), "")
-                    emails = [e.strip() for e in value.split(",") if e.strip()]
+                    emails = [e for e in map(str.strip, value.split(",")) if e]
                     job_copy[target] = emails
 
                 del job_copy[env_key]
         # ──────────────────────────────────────────────────────────────
 
         # Normalize booleans/ints if provided (best-effort)
-        for b in ("coalesce", "send_email"):
-            if b in job_copy:
-                job_copy[b] = _to_bool(job_copy[b], field=b, job_id=job_copy["id"])
+        for b in _BOOL_FIELDS:
+            v = job_copy.get(b, _MISSING)
+            if v is not _MISSING:
+                job_copy[b] = _to_bool(v, field=b, job_id=job_id)
 
-        for n, allow_zero in (("timeout_sec", True), ("max_instances", False), ("misfire_grace_time", True)):
-            if n in job_copy:
-                job_copy[n] = _to_int(job_copy[n], field=n, job_id=job_copy["id"], allow_zero=allow_zero)
+        for n, allow_zero in _INT_FIELDS:
+            v = job_copy.get(n, _MISSING)
+            if v is not _MISSING:
+                job_copy[n] = _to_int(v, field=n, job_id=job_id, allow_zero=allow_zero)
 
         # Email fields to list[str]
         for f in _EMAIL_FIELDS:
@@ -243,7 +312,7 @@ def _derive_job_id(job: dict[str, Any], idx: int) -> str:
 def _validate_daily_time(dt: Any, job_id: str) -> None:
     if not isinstance(dt, str):
         raise ConfigError(f"Job '{job_id}': 'daily_time' must be a string like 'HH:MM'.")
-    m = _DAILY_TIME_RE.match(dt.strip())
+    m = _DAILY_TIME_RE.match(dt)
     if not m:
         raise ConfigError(f"Job '{job_id}': 'daily_time' must match HH:MM (24h).")
     hour, minute = int(m.group(1)), int(m.group(2))
@@ -296,9 +365,9 @@ def _to_bool(value: Any, *, field: str, job_id: str) -> bool:
         return value
     if isinstance(value, str):
         v = value.strip().lower()
-        if v in {"1", "true", "yes", "on"}:
+        if v in _TRUE_STRINGS:
             return True
-        if v in {"0", "false", "no", "off"}:
+        if v in _FALSE_STRINGS:
             return False
     raise ConfigError(f"Job '{job_id}': '{field}' must be a boolean (or boolean-like string).")
 
@@ -314,10 +383,31 @@ def _to_int(value: Any, *, field: str, job_id: str, allow_zero: bool) -> int:
 
 
 def _read_any(path: str) -> _LoadResult:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError as e:
+        raise ConfigError(f"Config file not found: {path}") from e
+    except OSError as e:
+        raise ConfigError(f"Failed to read config file: {path}: {e}") from e
+    key = (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    with _CFG_CACHE_LOCK:
+        hit = _CFG_CACHE.get(path)
+    if hit is not None and hit[:3] == key:
+        return _LoadResult(cfg=copy.deepcopy(hit[3]), source=path)
+
+    lr = _parse_file(path)
+    with _CFG_CACHE_LOCK:
+        _CFG_CACHE[path] = (*key, lr.cfg)
+    return _LoadResult(cfg=copy.deepcopy(lr.cfg), source=path)
+
+
+def _parse_file(path: str) -> _LoadResult:
     lower = path.lower()
     try:
-        with open(path, encoding="utf-8") as f:
-            text = f.read()
+        # Raw bytes: orjson and libyaml both decode UTF-8 themselves.
+        with open(path, "rb") as f:
+            data = f.read()
     except FileNotFoundError as e:
         raise ConfigError(f"Config file not found: {path}") from e
     except OSError as e:
@@ -325,27 +415,27 @@ def _read_any(path: str) -> _LoadResult:
 
     if lower.endswith(".json"):
         try:
-            return _LoadResult(cfg=json.loads(text), source=path)
-        except json.JSONDecodeError as e:
+            return _LoadResult(cfg=_json_loads(data), source=path)
+        except ValueError as e:  # json/orjson decode errors subclass it
             raise ConfigError(f"Invalid JSON in {path}: {e}") from e
 
     if lower.endswith(".yml") or lower.endswith(".yaml"):
         if yaml is None:
             raise ConfigError("YAML config requested but PyYAML is not installed.")
         try:
-            data = yaml.safe_load(text)
-            if data is None:
-                data = {}
-            if not isinstance(data, dict):
+            parsed = yaml.load(data, Loader=_YamlLoader)  # C/SafeLoader only
+            if parsed is None:
+                parsed = {}
+            if not isinstance(parsed, dict):
                 raise ConfigError("Top-level YAML must be a mapping/object.")
-            return _LoadResult(cfg=data, source=path)
+            return _LoadResult(cfg=parsed, source=path)
         except Exception as e:
             raise ConfigError(f"Invalid YAML in {path}: {e}") from e
 
     # Try JSON as a fallback if extension is unknown
     try:
-        return _LoadResult(cfg=json.loads(text), source=path)
-    except json.JSONDecodeError:
+        return _LoadResult(cfg=_json_loads(data), source=path)
+    except ValueError:
         pass
 
     raise ConfigError(f"Unsupported config format for {path}. Use .json or .yml/.yaml (with PyYAML installed).")
@@ -1,15 +1,26 @@
 # service/emailer.py
 from __future__ import annotations
 
+import atexit
+import functools
+import logging
 import os
+import queue
+import random
 import smtplib
+import socket
 import ssl
+import threading
 import time
 import uuid
+from collections import defaultdict
 from collections.abc import Iterable
 from datetime import datetime
 from email.message import EmailMessage
 from email.utils import formatdate, make_msgid
+from typing import Any
+
+LOG = logging.getLogger(__name__)
 
 # ---- Errors -----------------------------------------------------------------
 
@@ -29,9 +40,11 @@ def _getenv_any(*names: str, default: str | None = None) -> str | None:
     return default
 
 
+@functools.lru_cache(maxsize=1)
 def _resolve_smtp_settings() -> dict:
     """
     Resolve SMTP settings from env with sane defaults and Proton Bridge compatibility.
+    Resolved once per process and shared (treat as read-only); see _reset_settings_cache().
 
     Preferred:
       - BRIDGE_USERNAME / BRIDGE_PASSWORD (Proton Bridge)
@@ -71,12 +84,20 @@ def _resolve_smtp_settings() -> dict:
         "password": password,
         "use_ssl": use_ssl,
         "starttls": starttls,  # "true" | "false" | "auto"
+        # Decisions derived from the fixed env, folded in once so send paths just read flags
+        "use_starttls": not use_ssl and _should_starttls(port, starttls),
+        "has_credentials": bool(host and username and password),
         "default_from_addr": default_from_addr,
         "default_from_name": default_from_name,
         "insecure_tls": insecure_tls,
     }
 
 
+def _reset_settings_cache() -> None:
+    """Forget resolved SMTP settings so the next send re-reads the environment (tests, credential rotation)."""
+    _resolve_smtp_settings.cache_clear()
+
+
 # ---- Helpers ----------------------------------------------------------------
 
 
@@ -95,6 +116,38 @@ def _should_starttls(port: int, starttls_setting: str) -> bool:
     return port not in (25, 2525)
 
 
+_LAST_STAMP: tuple[int, str] = (-1, "")
+_LAST_DATE: tuple[int, str] = (-1, "")
+
+
+@functools.lru_cache(maxsize=1)
+def _msgid_domain() -> str:
+    """
+    Host part for Message-IDs. make_msgid() would call socket.getfqdn() (possibly a
+    DNS lookup) for every message; resolve it once, on the first message rather than
+    at import, so importing emailer/runner/cli never blocks on DNS.
+    """
+    return socket.getfqdn()
+
+
+def _date_header() -> str:
+    """RFC 2822 local Date header value, formatted once per clock second."""
+    global _LAST_DATE
+    t = int(time.time())
+    if t != _LAST_DATE[0]:
+        _LAST_DATE = (t, formatdate(t, localtime=True))
+    return _LAST_DATE[1]
+
+
+def _stamp_now() -> str:
+    """Local 'YYYY-mm-dd HH:MM:SS' for the HTML trace comment, formatted once per clock second."""
+    global _LAST_STAMP
+    t = int(time.time())
+    if t != _LAST_STAMP[0]:
+        _LAST_STAMP = (t, datetime.fromtimestamp(t).strftime("%Y-%m-%d %H:%M:%S"))
+    return _LAST_STAMP[1]
+
+
 def _build_message(
     *,
     subject: str,
@@ -133,8 +186,8 @@ def _build_message(
     msg["Subject"] = subject
 
     # Standard headers
-    msg["Date"] = formatdate(localtime=True)
-    msg["Message-ID"] = make_msgid()
+    msg["Date"] = _date_header()
+    msg["Message-ID"] = make_msgid(domain=_msgid_domain())
     msg["X-Mailer-Nonce"] = uuid.uuid4().hex
 
     # User-supplied extra headers (avoid dangerous ones)
@@ -148,9 +201,7 @@ def _build_message(
 
     # Body (HTML with plain-text fallback)
     # Add a tiny stamp comment for traceability (harmless in HTML)
-    stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    nonce = uuid.uuid4().hex[:8]
-    html_augmented = html.rstrip() + f"\n<!-- mailer-ts:{stamp} nonce:{nonce} -->"
+    html_augmented = f"{html.rstrip()}\n<!-- mailer-ts:{_stamp_now()} nonce:{uuid.uuid4().hex[:8]} -->"
 
     msg.set_content("This message requires an HTML-capable client.")
     msg.add_alternative(html_augmented, subtype="html", charset="utf-8")
@@ -158,107 +209,226 @@ def _build_message(
     return msg
 
 
-def _send_via_smtp(msg: EmailMessage, *, rcpt_to: list[str], settings: dict) -> None:
+@functools.lru_cache(maxsize=2)
+def _tls_context(insecure: bool) -> ssl.SSLContext:
+    """Build each TLS context (cipher setup, CA bundle load) once and share it across connections."""
+    return ssl._create_unverified_context() if insecure else ssl.create_default_context()
+
+
+def _open_session(settings: dict) -> smtplib.SMTP:
+    """Connect, EHLO, optionally STARTTLS, and log in. Caller owns the returned session."""
     host = settings["host"]
     port = settings["port"]
-    username = settings["username"]
-    password = settings["password"]
     use_ssl = settings["use_ssl"]
-    starttls_setting = settings["starttls"]
-    insecure_tls = settings["insecure_tls"]
 
-    if not (host and username and password):
+    context = _tls_context(settings["insecure_tls"])
+
+    server = smtplib.SMTP_SSL(host, port, context=context) if use_ssl else smtplib.SMTP(host, port)
+    try:
+        # starttls() and login() each EHLO on demand (and starttls() resets the EHLO state)
+        if settings["use_starttls"]:
+            server.starttls(context=context)
+        server.login(settings["username"], settings["password"])
+    except BaseException:
+        _close_quietly(server)
+        raise
+    return server
+
+
+def _close_quietly(server: smtplib.SMTP) -> None:
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+
+# ---- Connection pool ---------------------------------------------------------
+
+# Max age (seconds) of a pooled SMTP session before it is recycled.
+_POOL_TTL = float(os.getenv("PROTON_SMTP_POOL_TTL", "90"))
+
+
+class _SMTPPool:
+    """
+    Keeps one idle, logged-in SMTP session per (host, port, username, use_ssl)
+    so consecutive sends skip the TCP/TLS/AUTH handshake.
+
+    acquire() hands a session to exactly one caller (it is removed from the pool
+    until release()), so smtplib objects are never shared between threads.
+    Sessions older than the TTL or failing NOOP are replaced.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._idle: dict[tuple, tuple[smtplib.SMTP, float]] = {}
+
+    @staticmethod
+    def _key(settings: dict) -> tuple:
+        return (settings["host"], settings["port"], settings["username"], settings["use_ssl"])
+
+    def acquire(self, settings: dict) -> tuple[smtplib.SMTP, float, bool]:
+        """Return (session, opened_at, reused)."""
+        with self._lock:
+            entry = self._idle.pop(self._key(settings), None)
+        if entry is not None:
+            server, opened_at = entry
+            if time.monotonic() - opened_at <= self._ttl:
+                try:
+                    if server.noop()[0] == 250:
+                        return server, opened_at, True
+                except Exception:
+                    pass
+            _close_quietly(server)
+        return _open_session(settings), time.monotonic(), False
+
+    def release(self, settings: dict, server: smtplib.SMTP, opened_at: float) -> None:
+        with self._lock:
+            previous = self._idle.get(self._key(settings))
+            self._idle[self._key(settings)] = (server, opened_at)
+        if previous is not None and previous[0] is not server:
+            _close_quietly(previous[0])
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for server, _ in idle.values():
+            _close_quietly(server)
+
+
+_POOL = _SMTPPool(_POOL_TTL)
+atexit.register(_POOL.close_all)
+
+# Max envelope recipients per SMTP transaction; larger lists are split and the same message re-sent per slice.
+_MAIL_CHUNK = max(1, int(os.getenv("MAIL_CHUNK", "1000")))
+# Opt-in: one transaction per recipient domain (for relays that fan out per destination domain).
+_BATCH_BY_DOMAIN = os.getenv("MAIL_BATCH_BY_DOMAIN", "false").strip().lower() == "true"
+
+
+def _envelopes(msg: EmailMessage, rcpt_to: list[str]) -> list[tuple[EmailMessage, list[str]]]:
+    """Split one message's recipients into transactions (per domain if enabled, at most _MAIL_CHUNK each)."""
+    if _BATCH_BY_DOMAIN:
+        by_domain: dict[str, list[str]] = defaultdict(list)
+        for addr in rcpt_to:
+            by_domain[addr.rpartition("@")[2].lower()].append(addr)
+        groups = list(by_domain.values())
+    else:
+        groups = [rcpt_to]
+
+    out: list[tuple[EmailMessage, list[str]]] = []
+    for group in groups:
+        if len(group) <= _MAIL_CHUNK:
+            out.append((msg, group))
+        else:
+            out.extend((msg, group[i : i + _MAIL_CHUNK]) for i in range(0, len(group), _MAIL_CHUNK))
+    return out
+
+
+def _send_batch_via_smtp(batch: list[tuple[EmailMessage, list[str]]], *, settings: dict) -> None:
+    """Send every (message, envelope recipients) pair over one pooled session, in order."""
+    if not settings["has_credentials"]:
         raise EmailSendError(
             "Missing SMTP credentials or host. "
             "Expected BRIDGE_USERNAME/BRIDGE_PASSWORD and SMTP_HOST (or compatible)."
         )
 
-    # TLS context
-    context = ssl._create_unverified_context() if insecure_tls else ssl.create_default_context()
-
+    sent = 0
     try:
-        server = smtplib.SMTP_SSL(host, port, context=context) if use_ssl else smtplib.SMTP(host, port)
-        with server:
-            server.ehlo()
-            if not use_ssl and _should_starttls(port, starttls_setting):
-                server.starttls(context=context)
-                server.ehlo()
-            server.login(username, password)
-            # send_message will derive recipients from headers; include BCC by explicit rcpt_to
-            server.send_message(msg, to_addrs=rcpt_to)
+        server, opened_at, reused = _POOL.acquire(settings)
+        try:
+            for msg, rcpt_to in batch:
+                try:
+                    # send_message will derive recipients from headers; include BCC by explicit rcpt_to
+                    server.send_message(msg, to_addrs=rcpt_to)
+                except smtplib.SMTPServerDisconnected:
+                    _close_quietly(server)
+                    if not reused:
+                        raise
+                    # The pooled session died after NOOP; reconnect once and carry on.
+                    reused = False
+                    server, opened_at = _open_session(settings), time.monotonic()
+                    server.send_message(msg, to_addrs=rcpt_to)
+                sent += 1
+        except BaseException:
+            _close_quietly(server)
+            raise
+        _POOL.release(settings, server, opened_at)
     except EmailSendError:
         raise
     except Exception as e:
+        if len(batch) > 1:
+            raise EmailSendError(f"SMTP send failed after {sent}/{len(batch)} transactions: {e}") from e
         raise EmailSendError(f"SMTP send failed: {e}") from e
 
 
+def _is_retryable(err: EmailSendError) -> bool:
+    """
+    Transient failures worth another attempt: dropped/refused connections,
+    timeouts, 4xx replies (incl. 421), and the Bridge's own "Internal server
+    error" responses. Other 5xx replies, auth, TLS/certificate and validation
+    errors fail fast.
+    """
+    text = str(err)
+    if "5xx" in text or "Internal server error" in text:
+        return True
+    cause = err.__cause__
+    # Every smtplib error subclasses OSError, so they are classified before the OSError fallback
+    if isinstance(cause, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(cause, smtplib.SMTPResponseException):
+        return 400 <= cause.smtp_code < 500
+    if isinstance(cause, smtplib.SMTPRecipientsRefused):
+        # Retry only if every refusal was temporary (e.g. greylisting)
+        codes = [code for code, _msg in cause.recipients.values()]
+        return bool(codes) and all(400 <= code < 500 for code in codes)
+    if isinstance(cause, (smtplib.SMTPException, ssl.SSLError)):
+        return False
+    return isinstance(cause, OSError)
+
+
 def _flatten_recipient_list(recipients: list | str | None) -> list[str]:
     """
-    Normalize recipients:
+    Normalize recipients in one pass:
     - None → []
     - str → [str]
-    - [str, ...] → [str, ...]
-    - [[str, ...]] → [str, ...]  ← Now handles multiple emails in inner list
-    - Deeply nested? → Only flatten one level
+    - [str, [str, ...], ...] → [str, ...]  (inner lists flattened one level)
+    - Non-string items at either level are dropped
     """
     if recipients is None:
         return []
+    if isinstance(recipients, str):
+        return [recipients]
+    if not isinstance(recipients, list):
+        return []
 
     result: list[str] = []
-
-    # Handle string
-    if isinstance(recipients, str):
-        result = [recipients]
-
-    # Handle list
-    elif isinstance(recipients, list):
-        # Case 1: List of strings → use directly
-        if recipients and isinstance(recipients[0], str):
-            result = [email for email in recipients if isinstance(email, str)]
-
-        # Case 2: List containing one list → flatten it
-        elif len(recipients) == 1 and isinstance(recipients[0], list):
-            inner = recipients[0]
-            result = inner if all(isinstance(x, str) for x in inner) else [x for x in inner if isinstance(x, str)]
-        # Case 3: List of mixed/nested → extract strings
-        else:
-            for item in recipients:
-                if isinstance(item, str):
-                    result.append(item)
-                elif isinstance(item, list):
-                    # Flatten any list inside, but only take strings
-                    result.extend(x for x in item if isinstance(x, str))
+    for item in recipients:
+        if isinstance(item, str):
+            result.append(item)
+        elif isinstance(item, list):
+            result.extend(x for x in item if isinstance(x, str))
     return result
 
 
 # ---- Public API --------------------------------------------------------------
 
 
-def send_html(
+def _prepare_html_message(
     *,
+    settings: dict,
     subject: str,
     html: str,
     to: list[str],
     cc: list[str] | None = None,
     bcc: list[str] | None = None,
     headers: dict[str, str] | None = None,
-) -> str:
-    """
-    Send an HTML email.
-
-    Returns:
-        message_id (str): RFC-822 Message-ID generated by the sender.
-
-    Raises:
-        EmailSendError on any failure (connection/auth/SMTP/validation/etc).
-    """
+) -> tuple[EmailMessage, list[str]]:
+    """Validate inputs and build (message, envelope recipients) for one send."""
     # === Normalize all recipient lists ===
     to = _flatten_recipient_list(to)
     cc = _flatten_recipient_list(cc)
     bcc = _flatten_recipient_list(bcc)
 
-    settings = _resolve_smtp_settings()
-
     # Resolve recipients and from
     to_l = _as_list(to)
     cc_l = _as_list(cc)
@@ -284,18 +454,152 @@ def send_html(
     rcpt_to = [*to_l, *cc_l, *bcc_l]
     if not rcpt_to:
         raise EmailSendError("No envelope recipients.")
+    return msg, rcpt_to
+
+
+def send_html(
+    *,
+    subject: str,
+    html: str,
+    to: list[str],
+    cc: list[str] | None = None,
+    bcc: list[str] | None = None,
+    headers: dict[str, str] | None = None,
+    sync: bool = True,
+) -> str:
+    """
+    Send an HTML email.
+
+    With sync=False the message is validated and built here, then handed to
+    background sender threads (SMTP_WORKERS, default 2); the call returns as
+    soon as it is queued and delivery failures are only logged.
+
+    Returns:
+        message_id (str): RFC-822 Message-ID generated by the sender.
+
+    Raises:
+        EmailSendError on any failure (connection/auth/SMTP/validation/etc);
+        for sync=False, only on validation failures.
+    """
+    settings = _resolve_smtp_settings()
+    msg, rcpt_to = _prepare_html_message(
+        settings=settings, subject=subject, html=html, to=to, cc=cc, bcc=bcc, headers=headers
+    )
+    if not sync:
+        _OUTBOX.submit(msg, rcpt_to, settings)
+        return str(msg["Message-ID"])
+    return _deliver(msg, rcpt_to, settings)
 
-    for attempt in range(4):
+
+def _deliver(msg: EmailMessage, rcpt_to: list[str], settings: dict) -> str:
+    """
+    Send one prepared message, retrying transient failures per envelope chunk.
+    A later chunk's retries never re-send earlier chunks, whose recipients already have it.
+    """
+    envelopes = _envelopes(msg, rcpt_to)
+    done = 0
+    try:
+        for env in envelopes:
+            _send_envelope_with_retry(env, settings)
+            done += 1
+    except EmailSendError as e:
+        if not done:
+            raise
+        raise EmailSendError(f"SMTP send failed after {done}/{len(envelopes)} transactions: {e}") from e
+    return str(msg["Message-ID"])
+
+
+def _send_envelope_with_retry(env: tuple[EmailMessage, list[str]], settings: dict) -> None:
+    attempts = 4
+    for attempt in range(attempts):
         try:
-            _send_via_smtp(msg, rcpt_to=rcpt_to, settings=settings)
-            return str(msg["Message-ID"])  # success
+            _send_batch_via_smtp([env], settings=settings)
+            return  # success
         except EmailSendError as e:  # noqa: PERF203
-            if "5xx" not in str(e) and "Internal server error" not in str(e):
+            if not _is_retryable(e) or attempt == attempts - 1:
                 raise
-            time.sleep(2**attempt)  # 2s, 4s, 8s, 16s
+            # The failed session was closed, not pooled, so the next attempt reconnects.
+            delay = min(30, 2 ** (attempt + 1)) + random.uniform(0, 1)  # ~2s, 4s, 8s
+            LOG.warning("SMTP send attempt %d/%d failed (%s); retrying in %.1fs", attempt + 1, attempts, e, delay)
+            time.sleep(delay)
     raise EmailSendError("Permanent send failure after retries")
 
 
+class _Outbox:
+    """
+    Queue + daemon sender threads behind send_html(sync=False). Threads start
+    on first use; at interpreter exit queued messages are drained (bounded
+    wait) before pooled SMTP sessions are closed.
+    """
+
+    _STOP = object()
+
+    def __init__(self, workers: int) -> None:
+        self._workers = max(1, workers)
+        self._q: queue.Queue = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(self, msg: EmailMessage, rcpt_to: list[str], settings: dict) -> None:
+        if not self._threads:
+            self._start()
+        self._q.put((msg, rcpt_to, settings))
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self._workers):
+                t = threading.Thread(target=self._run, name=f"smtp-sender-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+            # Registered after the pool's close_all, so it runs first (atexit is LIFO)
+            atexit.register(self.drain)
+
+    def _run(self) -> None:
+        while True:
+            item = self._q.get()
+            if item is self._STOP:
+                return
+            msg, rcpt_to, settings = item
+            try:
+                _deliver(msg, rcpt_to, settings)
+            except Exception:
+                LOG.exception("Background send failed for %s", msg["Message-ID"])
+
+    def drain(self, timeout: float = 30.0) -> None:
+        for _ in self._threads:
+            self._q.put(self._STOP)
+        deadline = time.monotonic() + timeout
+        for t in self._threads:
+            t.join(max(0.0, deadline - time.monotonic()))
+
+
+_OUTBOX = _Outbox(int(os.getenv("SMTP_WORKERS", "2")))
+
+
+def send_html_batch(messages: Iterable[dict[str, Any]]) -> list[str]:
+    """
+    Send several HTML emails back-to-back over a single SMTP session.
+
+    Each item holds the keyword arguments of send_html(). Every message is
+    validated and built before anything is sent.
+
+    Returns:
+        Message-IDs in input order.
+
+    Raises:
+        EmailSendError on any failure. Messages before the failing one have
+        already been delivered (the error says how many); nothing is retried.
+    """
+    settings = _resolve_smtp_settings()
+    prepared = [_prepare_html_message(settings=settings, **m) for m in messages]
+    batch = [env for msg, rcpt_to in prepared for env in _envelopes(msg, rcpt_to)]
+    if batch:
+        _send_batch_via_smtp(batch, settings=settings)
+    return [str(msg["Message-ID"]) for msg, _ in prepared]
+
+
 def ping() -> bool:
     """
     Lightweight health check against the SMTP relay.
@@ -303,27 +607,13 @@ def ping() -> bool:
     """
     settings = _resolve_smtp_settings()
 
-    host = settings["host"]
-    port = settings["port"]
-    username = settings["username"]
-    password = settings["password"]
-    use_ssl = settings["use_ssl"]
-    starttls_setting = settings["starttls"]
-    insecure_tls = settings["insecure_tls"]
-
-    if not (host and username and password):
+    if not settings["has_credentials"]:
         raise EmailSendError("SMTP health check failed: missing host/credentials.")
 
-    context = ssl._create_unverified_context() if insecure_tls else ssl.create_default_context()
-
     try:
-        server = smtplib.SMTP_SSL(host, port, context=context) if use_ssl else smtplib.SMTP(host, port)
-        with server:
-            server.ehlo()
-            if not use_ssl and _should_starttls(port, starttls_setting):
-                server.starttls(context=context)
-                server.ehlo()
-            server.login(username, password)
+        # A pooled session that still answers NOOP counts as healthy; otherwise a fresh login is made.
+        server, opened_at, _ = _POOL.acquire(settings)
+        _POOL.release(settings, server, opened_at)
         return True
     except Exception as e:
         raise EmailSendError(f"SMTP health check failed: {e}") from e
@@ -1,8 +1,14 @@
 # service/imap_commands/handlers.py
+import importlib.util
+import io
 import logging
 import re
 import subprocess
+import threading
 from datetime import datetime, timedelta
+from email.parser import BytesParser
+from email.policy import default as _email_policy
+from html import escape
 from html.parser import HTMLParser
 from pathlib import Path
 from typing import Any
@@ -10,12 +16,25 @@ from typing import Any
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from service import runner
+from service.config_schema import find_job
 from service.imap_commands.parser import parse_command_line
 from service.imap_commands.templates import list_html
 from service.scheduler import _add_job, _make_job_spec, _resolve_timezone
 
+# Prefer lxml (C tokenizer) for HTML → text; fall back to the stdlib HTMLParser stripper
+try:
+    import lxml.html as _lxml_html
+except ImportError:  # pragma: no cover
+    _lxml_html = None
+
 logger = logging.getLogger(__name__)
 
+# Substring match (not word-bounded), same as scanning line.upper() for each keyword
+_COMMAND_WORD_RE = re.compile(r"RUN|LIST|CAREER|REPORT", re.IGNORECASE)
+
+# Shared parser: parsebytes() builds a fresh FeedParser per call, so reuse is thread-safe
+_PARSER = BytesParser(policy=_email_policy)
+
 
 # --------------------------------------------------------------------------- #
 # Helper: strip HTML → plain text
@@ -32,33 +51,66 @@ class _Stripper(HTMLParser):
         return "".join(self.parts)
 
 
+def _html_to_text(html: str) -> str:
+    if _lxml_html is not None:
+        try:
+            return _lxml_html.fromstring(html).text_content()
+        except Exception:  # empty/unparseable document → stdlib stripper
+            pass
+    s = _Stripper()
+    s.feed(html)
+    return s.get()
+
+
+def _decode_text(part) -> str:
+    """Decode a text/* part's transfer-encoded payload with its declared charset."""
+    payload = part.get_payload(decode=True)
+    if not payload:
+        return ""
+    try:
+        return payload.decode(part.get_content_charset() or "utf-8", "replace")
+    except LookupError:  # unknown charset label
+        return payload.decode("utf-8", "replace")
+
+
+def _is_attachment(part) -> bool:
+    # The disposition type is the header's first token ("attachment; filename=...")
+    return (part.get("Content-Disposition") or "").lstrip().lower().startswith("attachment")
+
+
 def extract_text_from_email(msg) -> str:
     """Prefer first non-empty text/plain; fallback to longest stripped HTML."""
-    plain = None
-    html_parts = []
+    if not msg.is_multipart():
+        # Single-part fast path: no tree walk, no candidate list
+        if _is_attachment(msg):
+            return ""
+        ctype = msg.get_content_type()
+        if ctype == "text/plain":
+            return _decode_text(msg).strip()
+        if ctype == "text/html":
+            html = _decode_text(msg)
+            return _html_to_text(html).strip() if html else ""
+        return ""
 
-    for part in msg.walk() if msg.is_multipart() else [msg]:
-        ctype = (part.get_content_type() or "").lower()
-        disp = (part.get("Content-Disposition") or "").lower()
-        if "attachment" in disp:
+    html_parts = []
+    for part in msg.walk():
+        if _is_attachment(part):
             continue
+        ctype = part.get_content_type()
         if ctype == "text/plain":
-            text = part.get_content().strip()
-            if text and plain is None:
-                plain = text
+            text = _decode_text(part).strip()
+            if text:
+                return text  # first non-empty text/plain wins; skip the rest of the tree
             continue
         if ctype == "text/html":
-            html = part.get_content()
-            if html:
-                html_parts.append(html)
+            # Defer decoding: HTML is only needed when no text/plain part turns up
+            html_parts.append(part)
 
-    if plain:
-        return plain
     if html_parts:
-        html = max(html_parts, key=len)
-        s = _Stripper()
-        s.feed(html)
-        return s.get().strip()
+        # Pick by encoded size so only the chosen part is decoded
+        html = _decode_text(max(html_parts, key=lambda p: len(p.get_payload() or "")))
+        if html:
+            return _html_to_text(html).strip()
     return ""
 
 
@@ -68,15 +120,12 @@ def handle_command(
     scheduler: BackgroundScheduler | None,
     from_addr: str | None = None,
 ) -> tuple[str, str, str]:
-    from email import message_from_bytes
-    from email.policy import default
-
     """
     Process incoming email and return (reply_to, subject, html).
     NEVER sends email — caller handles it.
     reply_to = to_addr or sender (from ENVELOPE or From header)
     """
-    msg = message_from_bytes(raw_email, policy=default)
+    msg = _PARSER.parsebytes(raw_email)
 
     # Use passed from_addr; fall back to parsing if missing (defensive)
     sender = from_addr or msg["From"]
@@ -87,9 +136,9 @@ def handle_command(
 
     # Find command line
     command_line = subject
-    if not any(word in command_line.upper() for word in ("RUN", "LIST", "CAREER", "REPORT")):
+    if not _COMMAND_WORD_RE.search(command_line):
         for line in lines:
-            if any(word in line.upper() for word in ("RUN", "LIST", "CAREER", "REPORT")):
+            if _COMMAND_WORD_RE.search(line):
                 command_line = line
                 break
 
@@ -133,32 +182,92 @@ def handle_command(
     # ===================================================================
     else:
         subj = "Unknown Command"
-        html = f"<p>Did not understand:</p><pre>{command_line.strip()}</pre>"
+        html = f"<p>Did not understand:</p><pre>{escape(command_line.strip())}</pre>"
 
     return to_addr or sender, subj, html
 
 
+_CAREER_CHECK_PATH = Path("/app/scripts/career_check.py")
+_CAREER_CHECK_TIMEOUT = 120
+_career_check_mod = None
+
+
+def _load_career_check():
+    """Import scripts/career_check.py once and keep the module for later reports."""
+    global _career_check_mod
+    if _career_check_mod is None:
+        spec = importlib.util.spec_from_file_location("career_check", _CAREER_CHECK_PATH)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        _career_check_mod = mod
+    return _career_check_mod
+
+
+def _run_career_check_inprocess(mod) -> tuple[int, str, str] | None:
+    """
+    Run career_check.main() in a worker thread, writing into private buffers.
+    Returns (exit_code, stdout, stderr), or None if it overran the timeout.
+    """
+    out, err = io.StringIO(), io.StringIO()
+    result: dict[str, Any] = {}
+
+    def _target():
+        # --async: thread-based file reads; never fork a process pool from inside the service.
+        # Streams are passed in, not redirected: sys.stdout is process-wide and other threads log.
+        try:
+            mod.main(["--async"], out=out, err=err)
+            result["code"] = 0
+        except SystemExit as e:
+            result["code"] = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            print(f"Exception: {e}", file=err)
+            result["code"] = 1
+
+    t = threading.Thread(target=_target, name="career-check", daemon=True)
+    t.start()
+    t.join(_CAREER_CHECK_TIMEOUT)
+    if t.is_alive():
+        return None
+    return result.get("code", 1), out.getvalue(), err.getvalue()
+
+
 def _handle_career_report() -> tuple[str, str, str]:
-    script_path = Path("/app/scripts/career_check.py")
+    script_path = _CAREER_CHECK_PATH
     if not script_path.exists():
         return "", "Career Report - Error", "Error: career_check.py not found."
 
     try:
-        result = subprocess.run(
-            ["python", str(script_path)],
-            capture_output=True,
-            text=True,
-            check=False,
-            timeout=120,
-        )
-        output = result.stdout.strip()
-        if result.returncode != 0:
-            output = f"Script failed (exit {result.returncode})\n\n{result.stderr.strip()}\n\n{output}"
+        try:
+            mod = _load_career_check()
+        except Exception:
+            logger.warning("In-process career_check import failed; using a subprocess", exc_info=True)
+            mod = None
+
+        if mod is not None:
+            ran = _run_career_check_inprocess(mod)
+            if ran is None:
+                return "", "Career Report - Timeout", f"Error: Timed out after {_CAREER_CHECK_TIMEOUT}s"
+            returncode, stdout, stderr = ran
+        else:
+            result = subprocess.run(
+                ["python", str(script_path)],
+                capture_output=True,
+                text=True,
+                check=False,
+                timeout=_CAREER_CHECK_TIMEOUT,
+            )
+            returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
+
+        output = stdout.strip()
+        if returncode != 0:
+            output = f"Script failed (exit {returncode})\n\n{stderr.strip()}\n\n{output}"
+        elif stderr.strip():
+            output = f"{output}\n\n{stderr.strip()}"  # e.g. unreadable log files
         if not output:
             output = "No new postings found."
         return "", "Career Report", output
     except subprocess.TimeoutExpired:
-        return "", "Career Report - Timeout", "Error: Timed out after 120s"
+        return "", "Career Report - Timeout", f"Error: Timed out after {_CAREER_CHECK_TIMEOUT}s"
     except Exception as e:
         return "", "Career Report - Error", f"Exception: {e}"
 
@@ -171,7 +280,7 @@ def _handle_run(
     cfg: dict[str, Any],
     scheduler: BackgroundScheduler | None,
 ) -> tuple[str, str, str]:
-    job_cfg = next((j for j in cfg.get("jobs", []) if j.get("id") == module_id), None)
+    job_cfg = find_job(cfg, module_id)
 
     # Merge config defaults with any user overrides
     final_kwargs = {
@@ -237,13 +346,13 @@ def _handle_run(
         # Below result_html could be included in this email confirmation, but would be redundant
         # since the job itself will send the same email content
         # result_html = html_out or "<i>(no HTML returned)</i>"
-        reply_html = f"<p>Job <code>{module_id}</code> executed (run-id <code>{run_id}</code>).</p>"
+        reply_html = f"<p>Job <code>{escape(module_id)}</code> executed (run-id <code>{run_id}</code>).</p>"
         reply_subject = f"Result: {job_cfg.get('summary', module_id)}"
     except Exception as exc:
         logger.exception("Command-run failed for %s", module_id)
         reply_html = f"""
         <p><b>Execution failed:</b></p>
-        <pre>{exc}</pre>
+        <pre>{escape(str(exc))}</pre>
         """
         reply_subject = f"Result: {module_id}"
 
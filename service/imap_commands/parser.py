@@ -4,6 +4,17 @@ import json
 import re
 from typing import Any
 
+_SINGLE_WORD_RE = re.compile(r"\w+")
+_RUN_RE = re.compile(
+    r"""
+    ^\s*RUN\s+MODULE=(?P<module_id>[^\s"'][^\s]*|"[^"]*"|'[^']*')\s*
+    (?:KWARGS=(?P<kwargs>"[^"]*"|'[^']*'|\{.*\}))?\s*
+    (?:NO_EMAIL=(?P<no_email>true|false))?\s*
+    (?:PRINT_HTML=(?P<print_html>true|false))?\s*$
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
 
 def parse_command_line(line: str) -> dict[str, Any]:
     """
@@ -36,7 +47,7 @@ def parse_command_line(line: str) -> dict[str, Any]:
         return {"command": None}
 
     # --- 1. Single word command (e.g., LIST) ---
-    if re.fullmatch(r"\w+", line, re.IGNORECASE):
+    if _SINGLE_WORD_RE.fullmatch(line):
         return {"command": line.upper()}
 
     # --- 2. Multi-word command (e.g., CAREER REPORT) ---
@@ -45,17 +56,7 @@ def parse_command_line(line: str) -> dict[str, Any]:
         return {"command": "CAREER REPORT"}
 
     # --- 3. RUN MODULE=... with optional args ---
-    run_pattern = re.compile(
-        r"""
-        ^\s*RUN\s+MODULE=(?P<module_id>[^\s"'][^\s]*|"[^"]*"|'[^']*')\s*
-        (?:KWARGS=(?P<kwargs>"[^"]*"|'[^']*'|\{.*\}))?\s*
-        (?:NO_EMAIL=(?P<no_email>true|false))?\s*
-        (?:PRINT_HTML=(?P<print_html>true|false))?\s*$
-        """,
-        re.IGNORECASE | re.VERBOSE,
-    )
-
-    match = run_pattern.match(line)
+    match = _RUN_RE.match(line)
     if match:
         cmd = {
             "command": "RUN",
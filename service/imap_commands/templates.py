@@ -1,62 +1,81 @@
 # service/imap_commands/templates.py
 import textwrap
 from datetime import datetime
+from functools import singledispatch
+from html import escape
+from urllib.parse import quote
 
 from apscheduler.job import Job
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+_CRON_COLUMNS = ("minute", "hour", "day", "month", "day_of_week")
+_ROW = (
+    "<tr><td><code>{}</code></td><td><code>{}</code></td><td>{}</td>"
+    "<td><code>{}</code></td><td>{}</td><td>{}</td></tr>"
+)
+# Rows are joined at the <tbody> indentation so textwrap.dedent still sees the common margin
+_ROW_SEP = "\n" + " " * 16
+
+
+@singledispatch
+def _fmt_trigger(trigger) -> str:
+    return str(trigger)
+
+
+@_fmt_trigger.register
+def _(trigger: CronTrigger) -> str:
+    # CronTrigger keeps its expressions in .fields (there are no _minute/_hour attributes)
+    fields = {f.name: str(f) for f in trigger.fields}
+    return " ".join(fields.get(name, "*") for name in _CRON_COLUMNS)
+
+
+@_fmt_trigger.register
+def _(trigger: IntervalTrigger) -> str:
+    seconds = trigger.interval.total_seconds()
+    if seconds % 3600 == 0:
+        return f"every {int(seconds // 3600)} hour(s)"
+    if seconds % 60 == 0:
+        return f"every {int(seconds // 60)} minute(s)"
+    return f"every {seconds} second(s)"
+
+
+@_fmt_trigger.register
+def _(trigger: DateTrigger) -> str:
+    return trigger.run_date.strftime("%Y-%m-%d %H:%M:%S") if trigger.run_date else "—"
 
 
 def list_html(jobs: list[Job], first_id: str | None = None) -> str:
     if not jobs:
         return "<p>No jobs currently scheduled.</p>"
 
+    esc = escape  # local for the loop; quote=True is harmless in element text
     rows = []
     for job in jobs:
         trigger = job.trigger
-        trigger_type = type(trigger).__name__.replace("Trigger", "").lower()
-
-        if "CronTrigger" in type(trigger).__name__:
-            minute = getattr(trigger, "_minute", "*")
-            hour = getattr(trigger, "_hour", "*")
-            day = getattr(trigger, "_day", "*")
-            month = getattr(trigger, "_month", "*")
-            dow = getattr(trigger, "_day_of_week", "*")
-            trigger_str = f"{minute} {hour} {day} {month} {dow}"
-        elif hasattr(trigger, "interval"):
-            seconds = trigger.interval.total_seconds()
-            if seconds % 3600 == 0:
-                trigger_str = f"every {int(seconds // 3600)} hour(s)"
-            elif seconds % 60 == 0:
-                trigger_str = f"every {int(seconds // 60)} minute(s)"
-            else:
-                trigger_str = f"every {seconds} second(s)"
-        elif hasattr(trigger, "run_date"):
-            trigger_str = trigger.run_date.strftime("%Y-%m-%d %H:%M:%S") if trigger.run_date else "—"
-        else:
-            trigger_str = str(trigger)
+        trigger_type = trigger.__class__.__name__.removesuffix("Trigger").lower()
+        trigger_str = _fmt_trigger(trigger)
 
         next_run = job.next_run_time
         next_run_str = next_run.strftime("%Y-%m-%d %H:%M:%S") if next_run else "—"
 
-        module = job.kwargs.get("module", job.id)
-        send_email = job.kwargs.get("send_email", False)
-        email_flag = "Yes" if send_email else "No"
-
-        rows.append(f"""
-        <tr>
-            <td><code>{job.id}</code></td>
-            <td><code>{module}</code></td>
-            <td>{trigger_type}</td>
-            <td><code>{trigger_str}</code></td>
-            <td>{next_run_str}</td>
-            <td>{email_flag}</td>
-        </tr>
-        """)
+        kw = job.kwargs
+        module = kw.get("module", job.id)
+        email_flag = "Yes" if kw.get("send_email", False) else "No"
+
+        rows.append(
+            _ROW.format(esc(job.id), esc(str(module)), trigger_type, esc(trigger_str), next_run_str, email_flag)
+        )
 
     button_html = ""
     if first_id:
+        # Percent-encode for the mailto query first ("&", "#", "?" would split it), then HTML-escape
+        first_id_q = escape(quote(first_id, safe=""))
+        first_id = escape(first_id)
         mailto_link = (
-            f"mailto:?subject=RUN%20MODULE%3D{first_id}"
-            f"&body=RUN%20MODULE%3D{first_id}%0A"
+            f"mailto:?subject=RUN%20MODULE%3D{first_id_q}"
+            f"&body=RUN%20MODULE%3D{first_id_q}%0A"
             f"KWARGS%3D%7B%7D%0A"
             f"NO_EMAIL%3Dfalse%0A"
             f"PRINT_HTML%3Dfalse"
@@ -84,7 +103,7 @@ def list_html(jobs: list[Job], first_id: str | None = None) -> str:
                 </tr>
             </thead>
             <tbody>
-                {"".join(rows)}
+                {_ROW_SEP.join(rows)}
             </tbody>
         </table>
 
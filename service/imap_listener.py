@@ -1,17 +1,21 @@
 # service/imap_listener.py
 from __future__ import annotations
 
+import contextlib
 import logging
 import os
 import re
+import socket
 import threading
 import time
 from collections.abc import Callable
+from html import escape
 from pathlib import Path
 from typing import Any
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from imapclient import IMAPClient
+from imapclient.exceptions import IMAPClientError
 
 from service.emailer import EmailSendError, send_html
 from service.imap_commands import handle_command
@@ -20,11 +24,75 @@ logger = logging.getLogger(__name__)
 if not logger.handlers:
     logger.addHandler(logging.NullHandler())
 
+# New command emails are fetched in UID chunks of this size (one round trip each)
+_FETCH_BATCH = max(1, int(os.getenv("COMMAND_FETCH_BATCH", "100")))
+# BODY.PEEK[] returns the same bytes as RFC822 without setting \Seen on the server
+_BODY = "BODY.PEEK[]"
+_BODY_KEY = b"BODY[]"
+_FETCH_ITEMS = [_BODY, "ENVELOPE"]
+# Bodies larger than this are never downloaded (a command email is a few KB); 0 disables the cap
+_MAX_COMMAND_BYTES = int(os.getenv("COMMAND_MAX_BYTES", str(5 * 1024 * 1024)))
+# Bodies are fetched just before they are handled, in groups whose RFC822.SIZE sum stays under
+# this, so a chunk's bodies are never all held while slow commands run
+_BODY_BATCH_BYTES = max(1, int(os.getenv("COMMAND_BODY_BATCH_BYTES", str(1024 * 1024))))
+# Resolved mailbox names keyed by (user, wanted folder) -> (name, monotonic expiry); saves a LIST per reconnect
+_MAILBOX_CACHE_TTL = float(os.getenv("COMMAND_MAILBOX_CACHE_TTL", "3600"))
+_mailbox_cache: dict[tuple[str, str], tuple[str, float]] = {}
+
 # --------------------------------------------------------------------------- #
 # Public control surface
 # --------------------------------------------------------------------------- #
 _thread: threading.Thread | None = None
 _stop_event = threading.Event()
+# Socket of the live IMAP session, so stop() can break a blocking IDLE wait
+_active_sock: socket.socket | None = None
+
+
+def _interrupt_idle() -> None:
+    sock = _active_sock
+    if sock is not None:
+        with contextlib.suppress(OSError):
+            sock.shutdown(socket.SHUT_RDWR)
+
+
+def _enable_keepalive(sock: socket.socket | None) -> None:
+    """
+    TCP keepalive so a silently dropped connection (e.g. NAT timeout between the
+    listener and Bridge) errors out of a blocked IDLE in ~2 minutes, not ~2 hours.
+    The per-option tuning is Linux/macOS only and skipped where unavailable.
+    """
+    if sock is None:
+        return
+    with contextlib.suppress(OSError):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for opt, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 20), ("TCP_KEEPCNT", 3)):
+            if hasattr(socket, opt):
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, opt), value)
+
+
+def _body_groups(uids: list[int], sizes: dict[int, int]) -> list[list[int]]:
+    """Split uids, in order, into runs whose RFC822.SIZE sum stays within _BODY_BATCH_BYTES."""
+    groups: list[list[int]] = []
+    total = 0
+    for u in uids:
+        size = sizes.get(u, 0)
+        if groups and total + size <= _BODY_BATCH_BYTES:
+            groups[-1].append(u)
+            total += size
+        else:
+            groups.append([u])  # a single message above the budget still gets its own group
+            total = size
+    return groups
+
+
+def _fetch_bodies(client: IMAPClient, uids: list[int], fetched: dict) -> None:
+    """Add BODY[] to fetched[uid] for one group; on failure the caller fetches each message alone."""
+    try:
+        for u, body in client.fetch(uids, [_BODY]).items():
+            if u in fetched and _BODY_KEY in body:
+                fetched[u][_BODY_KEY] = body[_BODY_KEY]
+    except Exception:
+        logger.warning("Body fetch of %d UIDs failed; fetching one by one", len(uids), exc_info=True)
 
 
 class ListenerController:
@@ -35,6 +103,7 @@ class ListenerController:
     def stop(self) -> None:
         """Signal the listener loop to exit promptly."""
         self._stop.set()
+        _interrupt_idle()
 
     def join(self, timeout: float | None = None) -> None:
         """Wait for the listener thread to exit."""
@@ -74,6 +143,7 @@ def start(
 def stop() -> None:
     """Module-level convenience to stop the listener loop."""
     _stop_event.set()
+    _interrupt_idle()
 
 
 # --------------------------------------------------------------------------- #
@@ -93,12 +163,18 @@ def _command_listener_loop(
     - Persists last processed UID to resume after restarts
     - Uses exponential backoff on errors
     """
+    global _active_sock
     host = os.getenv("PROTON_IMAP_HOST", "proton_bridge")
     port = int(os.getenv("PROTON_IMAP_PORT", "143"))
     user = os.getenv("BRIDGE_USERNAME")
     pwd = os.getenv("BRIDGE_PASSWORD")
     want_folder = os.getenv("COMMANDS_FOLDER", "Command")
     idle_timeout = int(os.getenv("IMAP_IDLE_TIMEOUT", "30"))
+    # One IDLE is kept open across wakes and re-issued at least this often (RFC 2177: < 29 min)
+    idle_max = int(os.getenv("IMAP_IDLE_MAX_SECONDS", "1740"))
+    # Safety-net poll: re-search this often even without an EXISTS push, so mail whose
+    # EXISTS was sent outside IDLE (while commands ran) waits minutes, not ~29.
+    idle_refresh = min(idle_max, int(os.getenv("IMAP_POLL_SECONDS", "120")))
 
     if not (user and pwd):
         logger.error("Missing BRIDGE_USERNAME/BRIDGE_PASSWORD; command listener disabled.")
@@ -111,28 +187,41 @@ def _command_listener_loop(
     # Helper: resolve mailbox name (case-insensitive, with common prefixes)
     # --------------------------------------------------------------------- #
     def _resolve_mailbox(c: IMAPClient, desired: str) -> str:
+        key = (user, desired)
+        hit = _mailbox_cache.get(key)
+        if hit and hit[1] > time.monotonic():
+            return hit[0]
+        name = _match_mailbox(c, desired)
+        _mailbox_cache[key] = (name, time.monotonic() + _MAILBOX_CACHE_TTL)
+        return name
+
+    def _match_mailbox(c: IMAPClient, desired: str) -> str:
         desired_lc = desired.lower()
-        folders = [name.decode() if isinstance(name, bytes) else name for _flags, _delim, name in c.list_folders()]
-
-        # Exact match
-        if desired in folders:
+        # One pass over LIST: decode, index exact names, and lowercased name -> first spelling
+        exact: set[str] = set()
+        by_lc: dict[str, str] = {}
+        for _flags, _delim, name in c.list_folders():
+            n = name.decode() if isinstance(name, bytes) else name
+            exact.add(n)
+            by_lc.setdefault(n.lower(), n)
+
+        # Exact match, then case-insensitive
+        if desired in exact:
             return desired
-        # Case-insensitive match
-        for n in folders:
-            if n.lower() == desired_lc:
-                return n
+        if desired_lc in by_lc:
+            return by_lc[desired_lc]
         # Common prefixes: Labels/, Folders/
         for prefix in ("Labels/", "Folders/"):
             cand = prefix + desired
-            if cand in folders:
+            if cand in exact:
                 return cand
-            for n in folders:
-                if n.lower() == cand.lower():
-                    return n
-        # Fallback: ends with "/Command"
-        for n in folders:
-            if n.lower().endswith("/" + desired_lc):
-                return n
+            if cand.lower() in by_lc:
+                return by_lc[cand.lower()]
+        # Fallback: ends with "/Command" (only scanned when every lookup missed)
+        suffix = "/" + desired_lc
+        hit = next((n for lc, n in by_lc.items() if lc.endswith(suffix)), None)
+        if hit is not None:
+            return hit
         raise ValueError(f"Mailbox {desired!r} not found")
 
     # --------------------------------------------------------------------- #
@@ -149,15 +238,25 @@ def _command_listener_loop(
         base.mkdir(parents=True, exist_ok=True)
         return base / f"command_last_uid_{safe}.txt"
 
+    saved_uids: dict[Path, int] = {}  # last value on disk per state file
+
     def _load_last_uid(p: Path) -> int:
         try:
-            return int(p.read_text().strip())
+            uid = int(p.read_text().strip())
         except Exception:
             return 0  # Start from scratch if file is missing/corrupted
+        saved_uids[p] = uid
+        return uid
 
     def _save_last_uid(p: Path, uid: int) -> None:
+        if saved_uids.get(p) == uid:
+            return
+        # Write-then-rename so a crash never leaves a truncated/empty state file
+        tmp = p.with_name(p.name + ".tmp")
         try:
-            p.write_text(str(uid))
+            tmp.write_text(str(uid))
+            os.replace(tmp, p)
+            saved_uids[p] = uid
         except Exception as e:
             logger.warning("Failed to save last UID to %s: %s", p, e)
 
@@ -167,10 +266,20 @@ def _command_listener_loop(
     while not stop_event.is_set():
         try:
             with IMAPClient(host, port, ssl=False) as client:
+                _active_sock = client.socket()
+                _enable_keepalive(_active_sock)
+                if stop_event.is_set():
+                    break
                 client.login(user, pwd)
                 mailbox = _resolve_mailbox(client, want_folder)
+                try:
+                    client.select_folder(mailbox)
+                except IMAPClientError:
+                    # Cached name went stale (folder renamed/removed): re-list once
+                    _mailbox_cache.pop((user, want_folder), None)
+                    mailbox = _resolve_mailbox(client, want_folder)
+                    client.select_folder(mailbox)
                 logger.info("[commands] Listening on mailbox: %s", mailbox)
-                client.select_folder(mailbox)
 
                 state_file = _state_uid_path(mailbox)
                 last_uid = _load_last_uid(state_file)
@@ -184,79 +293,136 @@ def _command_listener_loop(
                 # -----------------------------------------------------------------
                 # Process any emails already present (above last_uid)
                 # -----------------------------------------------------------------
-                def _process_new_emails(state_file: Path) -> None:
+                def _handle_fetched(data: dict, cfg: dict[str, Any]) -> None:
+                    raw_email = data[_BODY_KEY]
+                    envelope = data.get(b"ENVELOPE")
+
+                    # Extract sender reliably from ENVELOPE
+                    from_addr = None
+                    if envelope and envelope.from_ and envelope.from_[0]:
+                        addr = envelope.from_[0]
+                        from_addr = f"{addr.mailbox.decode()}@{addr.host.decode()}"
+
+                    to_addr, subject, content = handle_command(raw_email, cfg, scheduler, from_addr)
+
+                    reply_to = to_addr or from_addr
+                    if reply_to:
+                        try:
+                            if content.startswith("<"):
+                                send_html(subject=subject, html=content, to=[reply_to])
+                            else:
+                                send_html(
+                                    subject=subject,
+                                    html="<pre style='font-family: monospace; "
+                                    f"white-space: pre-wrap;'>{escape(content)}</pre>",
+                                    to=[reply_to],
+                                )
+                        except EmailSendError:
+                            logger.error("Failed to send reply to %s", reply_to, exc_info=True)
+
+                def _process_new_emails(state_file: Path) -> bool:
+                    """Handle UIDs above last_uid; True if last_uid advanced."""
                     nonlocal last_uid
+                    start_uid = last_uid
                     if stop_event.is_set():
-                        return
-                    new_uids = [u for u in client.search(["ALL"]) if u > last_uid]
+                        return False
+                    # Server-side range; "N:*" always matches the highest UID, hence the filter
+                    new_uids = [u for u in client.search(["UID", f"{last_uid + 1}:*"]) if u > last_uid]
                     if not new_uids:
-                        return
+                        return False
                     new_uids.sort()
-                    for uid in new_uids:
+                    # One FETCH round trip per chunk instead of per message
+                    for i in range(0, len(new_uids), _FETCH_BATCH):
                         if stop_event.is_set():
-                            return
+                            return last_uid != start_uid
+                        chunk = new_uids[i : i + _FETCH_BATCH]
+                        # Headers and sizes first; full bodies only for what could be a command,
+                        # fetched group by group as the loop below reaches each group's first UID
+                        groups: dict[int, list[int]] = {}
                         try:
-                            data = client.fetch(uid, ["RFC822", "ENVELOPE"])
-                            raw_email = data[uid][b"RFC822"]
-                            envelope = data[uid].get(b"ENVELOPE")
-
-                            # Extract sender reliably from ENVELOPE
-                            from_addr = None
-                            if envelope and envelope.from_ and envelope.from_[0]:
-                                addr = envelope.from_[0]
-                                from_addr = f"{addr.mailbox.decode()}@{addr.host.decode()}"
-
-                            cfg = cfg_getter() if cfg_getter else {}
-                            to_addr, subject, content = handle_command(raw_email, cfg, scheduler, from_addr)
-
-                            reply_to = to_addr or from_addr
-                            if reply_to:
-                                try:
-                                    if content.startswith("<"):
-                                        send_html(subject=subject, html=content, to=[reply_to])
-                                    else:
-                                        send_html(
-                                            subject=subject,
-                                            html="<pre style='font-family: monospace; "
-                                            "white-space: pre-wrap;'>{content}</pre>",
-                                            to=[reply_to],
-                                        )
-                                except EmailSendError:
-                                    logger.error("Failed to send reply to %s", reply_to, exc_info=True)
-
-                            last_uid = uid
-                            _save_last_uid(state_file, last_uid)
-                        except Exception as e:
-                            logger.error("Failed to process email UID %s: %s", uid, e, exc_info=True)
-
-                _process_new_emails(state_file)
+                            fetched = client.fetch(chunk, ["ENVELOPE", "RFC822.SIZE"])
+                            sizes = {u: d.get(b"RFC822.SIZE", 0) for u, d in fetched.items()}
+                            oversized = {u: n for u, n in sizes.items() if 0 < _MAX_COMMAND_BYTES < n}
+                            wanted = [u for u in chunk if u in fetched and u not in oversized]
+                            groups = {g[0]: g for g in _body_groups(wanted, sizes)}
+                        except Exception:
+                            logger.warning(
+                                "Batch fetch of %d UIDs failed; fetching one by one", len(chunk), exc_info=True
+                            )
+                            fetched, oversized = None, {}
+                        cfg = cfg_getter() if cfg_getter else {}  # once per chunk, not per message
+                        for uid in chunk:
+                            if stop_event.is_set():
+                                return last_uid != start_uid
+                            try:
+                                if uid in oversized:
+                                    logger.warning(
+                                        "Skipping email UID %s: %s bytes exceeds COMMAND_MAX_BYTES",
+                                        uid,
+                                        oversized[uid],
+                                    )
+                                else:
+                                    if uid in groups:
+                                        _fetch_bodies(client, groups.pop(uid), fetched)
+                                    # pop: a handled body is not kept for the rest of the chunk
+                                    data = fetched.pop(uid, None) if fetched is not None else None
+                                    if data is None or _BODY_KEY not in data:
+                                        data = client.fetch(uid, _FETCH_ITEMS)[uid]
+                                    _handle_fetched(data, cfg)
+                                # Saved per message (not per chunk): a restart must never re-run a command
+                                last_uid = uid
+                                _save_last_uid(state_file, last_uid)
+                            except Exception as e:
+                                logger.error("Failed to process email UID %s: %s", uid, e, exc_info=True)
+                    return last_uid != start_uid
+
+                def _drain_new_emails(state_file: Path) -> None:
+                    # Re-search until a pass finds nothing new: mail that arrives while
+                    # commands run (RUN / CAREER REPORT can take minutes) announces itself
+                    # with an EXISTS outside IDLE, which idle_check would never see.
+                    while not stop_event.is_set() and _process_new_emails(state_file):
+                        pass
+
+                _drain_new_emails(state_file)
 
                 # -----------------------------------------------------------------
-                # Enter IDLE mode and wait for new emails
+                # Enter IDLE mode and wait for new emails. IDLE/DONE are only
+                # exchanged when the server pushes EXISTS or the poll/refresh is due;
+                # a quiet idle_check timeout just loops (and re-checks stop).
                 # -----------------------------------------------------------------
-                while not stop_event.is_set():
-                    client.idle()
-                    try:
-                        client.idle_check(timeout=idle_timeout)
-                    finally:
+                client.idle()
+                idling, idle_since = True, time.monotonic()
+                try:
+                    while not stop_event.is_set():
+                        responses = client.idle_check(timeout=idle_timeout)
+                        new_mail = any(len(r) > 1 and r[1] == b"EXISTS" for r in responses)
+                        if not new_mail and time.monotonic() - idle_since < idle_refresh:
+                            continue
                         client.idle_done()
-                    _process_new_emails(state_file)
+                        idling = False
+                        _drain_new_emails(state_file)
+                        client.idle()
+                        idling, idle_since = True, time.monotonic()
+                finally:
+                    if idling:
+                        with contextlib.suppress(Exception):
+                            client.idle_done()
 
             # Success: reset backoff
             backoff = 30
 
-        except Exception as e:  # noqa: PERF203
+        except Exception as e:
+            _active_sock = None
             # Only handle errors if not shutting down
             if stop_event.is_set():
                 break
 
             logger.error("[commands] Connection/error: %r - retrying in %ds", e, backoff)
 
-            # Exponential backoff with cap
-            slept = 0
-            while slept < backoff and not stop_event.is_set():
-                time.sleep(1)
-                slept += 1
+            # Exponential backoff with cap; wakes immediately on stop
+            if stop_event.wait(timeout=backoff):
+                break
             backoff = min(backoff * 2, 300)  # Max 5 minutes
 
+    _active_sock = None
     logger.info("[commands] Listener stopped")
@@ -1,14 +1,25 @@
 # service/logging_utils.py
 from __future__ import annotations
 
+import atexit
 import contextlib
 import datetime as _dt
 import json
+import logging
 import os
+import queue
+import re
 import socket
-from collections.abc import Iterable
+import threading
+import time
+from functools import lru_cache
 from typing import Any
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None
+
 # ---- Configuration (env-driven, with sensible defaults) ---------------------
 
 # Base directory for logs (mounted volume recommended, e.g., ./local/logs)
@@ -40,6 +51,22 @@ _DEFAULT_REDACT_KEYS = {
 _HOSTNAME = socket.gethostname()
 _PID = os.getpid()
 
+# Cumulative nanoseconds spent in the append syscalls (approximate under concurrent writers).
+_WRITE_NS = 0
+
+# Opt-in background writer: callers only enqueue; redaction, serialization and the
+# append happen on one daemon thread that batches adjacent records into one write().
+_ASYNC = os.getenv("ACTIVITY_LOG_ASYNC", "").strip().lower() in {"1", "true", "yes", "on"}
+_QUEUE_MAX = int(os.getenv("ACTIVITY_LOG_QUEUE_MAX", "10000"))
+_BATCH_MAX = 256
+
+# Append descriptors stay open across writes; reopened after this many seconds so an
+# externally rotated/deleted file is picked up. fsync at most every N ms (0 = never).
+_FD_TTL = float(os.getenv("ACTIVITY_LOG_FD_TTL", "60"))
+_FSYNC_MS = int(os.getenv("ACTIVITY_LOG_FSYNC_MS", "0"))
+
+_LOG = logging.getLogger(__name__)
+
 
 # ---- Public API --------------------------------------------------------------
 
@@ -51,8 +78,12 @@ def write_activity_log(record: dict[str, Any]) -> None:
 
     May raise on unrecoverable I/O/serialization errors.
     Should never mutate the passed-in dict.
+
+    With ACTIVITY_LOG_ASYNC=1 the record is queued for the background writer
+    instead; errors are then logged rather than raised, and nested values must
+    not be mutated after the call.
     """
-    _write_jsonl(_log_path_for_today(_ACTIVITY_PREFIX), record)
+    _submit(_log_path_for_today(_ACTIVITY_PREFIX), record)
 
 
 # Nice-to-have helpers
@@ -60,7 +91,17 @@ def write_activity_log(record: dict[str, Any]) -> None:
 
 def write_error_log(record: dict[str, Any]) -> None:
     """Persist a single structured error record (JSON-safe), parallel to activity log."""
-    _write_jsonl(_log_path_for_today(_ERROR_PREFIX), record)
+    _submit(_log_path_for_today(_ERROR_PREFIX), record)
+
+
+def flush(timeout: float = 5.0) -> None:
+    """Block until records queued for the background writer are on disk (no-op when synchronous)."""
+    _WRITER.flush(timeout)
+
+
+def get_write_time_ns() -> int:
+    """Return total time this process has spent blocked appending log lines, in nanoseconds."""
+    return _WRITE_NS
 
 
 def get_activity_log_path() -> str:
@@ -73,16 +114,26 @@ def redact(record: dict[str, Any], keys: set[str] | None = None) -> dict[str, An
     Produce a redacted deep copy of `record` by scrubbing values whose KEYS
     contain any of the substrings in `keys` (case-insensitive). Does not mutate input.
     """
-    return _redact_deep(record, keys or _DEFAULT_REDACT_KEYS)
+    matcher = _compile_patterns(frozenset(keys)) if keys else _DEFAULT_REDACT_RE
+    return _redact_deep(record, matcher)
 
 
 # ---- Internal helpers --------------------------------------------------------
 
 
+# prefix -> (path, epoch of the next local midnight); the path only changes at the date rollover
+_path_cache: dict[str, tuple[str, float]] = {}
+
+
 def _log_path_for_today(prefix: str) -> str:
-    today = _dt.date.today().isoformat()  # YYYY-MM-DD
-    log_dir = os.path.join(_LOG_DIR)
-    return os.path.join(log_dir, f"{prefix}-{today}.jsonl")
+    hit = _path_cache.get(prefix)
+    if hit is not None and time.time() < hit[1]:
+        return hit[0]
+    today = _dt.date.today()
+    path = os.path.join(_LOG_DIR, f"{prefix}-{today.isoformat()}.jsonl")  # YYYY-MM-DD
+    expiry = _dt.datetime.combine(today + _dt.timedelta(days=1), _dt.time.min).timestamp()
+    _path_cache[prefix] = (path, expiry)
+    return path
 
 
 def _ensure_dir(path: str) -> None:
@@ -118,13 +169,25 @@ def _json_dumps(obj: Any) -> str:
     return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
 
 
+def _json_line(obj: Any) -> bytes:
+    """One UTF-8 JSONL line. orjson when installed; stdlib for anything it rejects (e.g. >64-bit ints)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+        except TypeError:  # orjson.JSONEncodeError subclasses it
+            pass
+    return (_json_dumps(obj) + "\n").encode("utf-8")
+
+
+_BEARER_RE = re.compile("bearer ", re.IGNORECASE)
+
+
 def _safe_bearer_scrub(value: str) -> str:
     """
     If a string looks like an Authorization header ("Bearer <token>") or similar,
     scrub the token part. Keeps the scheme for usefulness.
     """
-    lower = value.lower()
-    if "bearer " in lower:
+    if _BEARER_RE.search(value):
         # Preserve scheme, replace the rest.
         try:
             scheme, _ = value.split(" ", 1)
@@ -134,32 +197,110 @@ def _safe_bearer_scrub(value: str) -> str:
     return value
 
 
-def _key_matches(name: str, patterns: Iterable[str]) -> bool:
-    n = name.lower()
-    return any(pat in n for pat in patterns)
+@lru_cache(maxsize=16)
+def _compile_patterns(patterns: frozenset[str]) -> re.Pattern[str]:
+    """One case-insensitive alternation for a key-pattern set (never matches when empty)."""
+    if not patterns:
+        return re.compile(r"(?!)")
+    return re.compile("|".join(re.escape(p) for p in sorted(patterns)), re.IGNORECASE)
 
 
-def _redact_deep(value: Any, patterns: Iterable[str]) -> Any:
+_DEFAULT_REDACT_RE = _compile_patterns(frozenset(_DEFAULT_REDACT_KEYS))
+
+
+_CIRCULAR = "Circular reference in log record"
+
+
+def _key_matches(name: str, matcher: re.Pattern[str]) -> bool:
+    return matcher.search(name) is not None
+
+
+def _needs_redaction(value: Any, matcher: re.Pattern[str]) -> bool:
+    """
+    True if _redact_deep would change anything: some key matches a pattern or
+    some string looks like a bearer token. Iterative and allocation-light, so
+    the common clean record skips the deep copy entirely.
+
+    Raises ValueError on a self-referencing record. Each entry carries its depth,
+    so `path` holds the ids of the containers enclosing it; shared (non-cyclic)
+    sub-objects are fine.
+    """
+    stack: list[tuple[Any, int]] = [(value, 0)]
+    path: list[int] = []
+    on_path: set[int] = set()
+    while stack:
+        v, depth = stack.pop()
+        while len(path) > depth:
+            on_path.discard(path.pop())
+        if isinstance(v, (dict, list, tuple)):
+            vid = id(v)
+            if vid in on_path:
+                raise ValueError(_CIRCULAR)
+            path.append(vid)
+            on_path.add(vid)
+            depth += 1
+            if isinstance(v, dict):
+                for k, item in v.items():
+                    if isinstance(k, str) and _key_matches(k, matcher):
+                        return True
+                    stack.append((item, depth))
+            else:
+                stack.extend((item, depth) for item in v)
+        elif isinstance(v, str) and _BEARER_RE.search(v):
+            return True
+    return False
+
+
+def _redact_deep(value: Any, matcher: re.Pattern[str]) -> Any:
     """
     Deep-copy and redact dict/list structures. Keys that match patterns have their
     values replaced with "***REDACTED***". Strings that look like bearer tokens are scrubbed.
+
+    Walks an explicit worklist instead of recursing (no per-node call overhead, no
+    RecursionError on deep input). Each entry is (dst, key, src, depth): dst[key]
+    receives the redacted copy of src. Tuples are built as lists and frozen
+    afterwards, innermost first. Raises ValueError on a self-referencing record,
+    tracked the same way as in _needs_redaction.
     """
-    if isinstance(value, dict):
-        out: dict[str, Any] = {}
-        for k, v in value.items():
-            if isinstance(k, str) and _key_matches(k, patterns):
-                out[k] = "***REDACTED***"
+    holder: list[Any] = [None]
+    todo: list[tuple[Any, Any, Any, int]] = [(holder, 0, value, 0)]
+    tuples: list[tuple[Any, Any, list[Any]]] = []
+    path: list[int] = []
+    on_path: set[int] = set()
+    while todo:
+        dst, key, v, depth = todo.pop()
+        while len(path) > depth:
+            on_path.discard(path.pop())
+        if isinstance(v, (dict, list, tuple)):
+            vid = id(v)
+            if vid in on_path:
+                raise ValueError(_CIRCULAR)
+            path.append(vid)
+            on_path.add(vid)
+            depth += 1
+            if isinstance(v, dict):
+                out: dict[Any, Any] = {}
+                dst[key] = out
+                for k, item in v.items():
+                    if isinstance(k, str) and _key_matches(k, matcher):
+                        out[k] = "***REDACTED***"
+                    else:
+                        out[k] = None  # placeholder keeps key order
+                        todo.append((out, k, item, depth))
             else:
-                out[k] = _redact_deep(v, patterns)
-        return out
-    if isinstance(value, list):
-        return [_redact_deep(v, patterns) for v in value]
-    if isinstance(value, tuple):
-        return tuple(_redact_deep(v, patterns) for v in value)
-    if isinstance(value, str):
-        return _safe_bearer_scrub(value)
-    # Primitive (int/float/bool/None) or other JSON-safe types pass through.
-    return value
+                seq = [None] * len(v)
+                dst[key] = seq
+                if isinstance(v, tuple):
+                    tuples.append((dst, key, seq))
+                todo.extend((seq, i, item, depth) for i, item in enumerate(v))
+        elif isinstance(v, str):
+            dst[key] = _safe_bearer_scrub(v)
+        else:
+            # Primitive (int/float/bool/None) or other JSON-safe types pass through.
+            dst[key] = v
+    for dst, key, seq in reversed(tuples):
+        dst[key] = tuple(seq)
+    return holder[0]
 
 
 def _with_metadata(copy_of_record: dict[str, Any]) -> dict[str, Any]:
@@ -180,47 +321,197 @@ def _with_metadata(copy_of_record: dict[str, Any]) -> dict[str, Any]:
     return out
 
 
+# '"_meta":{"host":...,"pid":...}' is fixed per process: encoded once, spliced into each line
+_META_FRAGMENT = _json_line({"_meta": {"host": _HOSTNAME, "pid": _PID}})[1:-2]
+
+
+def _encode_line(record: dict[str, Any]) -> bytes:
+    # Redact and add metadata; do not mutate caller's dict.
+    if _needs_redaction(record, _DEFAULT_REDACT_RE):
+        record = _redact_deep(record, _DEFAULT_REDACT_RE)
+    if "_meta" in record:
+        # Caller-supplied _meta is merged with host/pid
+        return _json_line(_with_metadata(record))
+    line = _json_line(record)  # b'{...}\n'
+    if line == b"{}\n":
+        return b"{" + _META_FRAGMENT + b"}\n"
+    return line[:-2] + b"," + _META_FRAGMENT + b"}\n"
+
+
+def _submit(path: str, record: dict[str, Any]) -> None:
+    if _ASYNC and _WRITER.submit(path, record):
+        return
+    _write_jsonl(path, record)
+
+
+class _FdCache:
+    """
+    O_APPEND descriptors kept open per path, shared by the synchronous path and
+    the background writer. A descriptor is reopened after size rotation, after
+    _FD_TTL seconds, or when a write on it fails; the directory is only created
+    when an open fails. Old days' files are closed as new paths appear.
+    """
+
+    _FLAGS = os.O_CREAT | os.O_APPEND | os.O_WRONLY
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._fds: dict[str, tuple[int, float]] = {}
+        self._last_sync = time.monotonic()
+
+    def append(self, path: str, data: bytes) -> None:
+        global _WRITE_NS
+        t0 = time.perf_counter_ns()
+        try:
+            with self._lock:
+                if _should_rotate_size(path):
+                    self._close(path)
+                    _rotate_file_if_needed(path)
+                fd = self._get(path)
+                try:
+                    os.write(fd, data)  # Single write; O_APPEND ensures atomicity on POSIX.
+                except OSError:
+                    # Retry once on a fresh descriptor (stale fd or transient issue).
+                    self._close(path)
+                    fd = self._get(path)
+                    os.write(fd, data)
+                if _FSYNC_MS > 0 and (time.monotonic() - self._last_sync) * 1000 >= _FSYNC_MS:
+                    for f, _ in self._fds.values():
+                        with contextlib.suppress(OSError):
+                            os.fsync(f)
+                    self._last_sync = time.monotonic()
+        finally:
+            _WRITE_NS += time.perf_counter_ns() - t0
+
+    def close_all(self) -> None:
+        with self._lock:
+            for path in list(self._fds):
+                self._close(path)
+
+    def _get(self, path: str) -> int:
+        hit = self._fds.get(path)
+        now = time.monotonic()
+        if hit is not None:
+            if now - hit[1] < _FD_TTL:
+                return hit[0]
+            self._close(path)
+        # Only a couple of files are live at once (activity/error); older days' are done
+        if len(self._fds) >= 4:
+            for p in list(self._fds):
+                self._close(p)
+        try:
+            fd = os.open(path, self._FLAGS, 0o644)  # 0o644 typical; umask may reduce this further
+        except FileNotFoundError:
+            _ensure_dir(path)
+            fd = os.open(path, self._FLAGS, 0o644)
+        self._fds[path] = (fd, now)
+        return fd
+
+    def _close(self, path: str) -> None:
+        hit = self._fds.pop(path, None)
+        if hit is not None:
+            with contextlib.suppress(OSError):
+                os.close(hit[0])
+
+
+_FDS = _FdCache()
+atexit.register(_FDS.close_all)
+
+
+class _LogWriter:
+    """
+    Queue + one daemon thread behind ACTIVITY_LOG_ASYNC. The thread starts on
+    first use, drains whatever is queued (up to _BATCH_MAX), and appends each
+    file's lines with a single write through the shared descriptor cache. A full queue makes the
+    caller write synchronously, so records are never dropped.
+    """
+
+    _STOP = object()
+
+    def __init__(self, maxsize: int) -> None:
+        self._q: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, path: str, record: dict[str, Any]) -> bool:
+        if self._thread is None:
+            self._start()
+        try:
+            self._q.put_nowait((path, dict(record)))
+        except queue.Full:
+            return False
+        return True
+
+    def flush(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        done = threading.Event()
+        try:
+            self._q.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            t = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+            t.start()
+            self._thread = t
+            atexit.register(self._drain)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._q.get()]
+            with contextlib.suppress(queue.Empty):
+                while len(batch) < _BATCH_MAX:
+                    batch.append(self._q.get_nowait())
+            lines: dict[str, list[bytes]] = {}
+            waiters: list[threading.Event] = []
+            stop = False
+            for item in batch:
+                if item is self._STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    path, record = item
+                    try:
+                        lines.setdefault(path, []).append(_encode_line(record))
+                    except Exception:
+                        _LOG.exception("Dropping unserializable log record for %s", path)
+            for path, chunks in lines.items():
+                try:
+                    _FDS.append(path, b"".join(chunks))
+                except OSError:  # noqa: PERF203
+                    _LOG.exception("Failed to append %d log record(s) to %s", len(chunks), path)
+            for w in waiters:
+                w.set()
+            if stop:
+                return
+
+    def _drain(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        with contextlib.suppress(queue.Full):
+            self._q.put(self._STOP, timeout=timeout)
+        self._thread.join(timeout)
+
+
+_WRITER = _LogWriter(_QUEUE_MAX)
+
+
 def _write_jsonl(path: str, record: dict[str, Any]) -> None:
     """
     Core writer:
       - makes a deep redacted copy
       - enriches with host/pid
       - rotates by size (optional)
-      - appends a single line atomically (POSIX O_APPEND)
+      - appends a single line atomically (POSIX O_APPEND) on a cached descriptor
       - retries once on transient OSError
     """
-    _ensure_dir(path)
-
-    # Rotate by size if configured (date-based rotation happens automatically via filename).
-    _rotate_file_if_needed(path)
-
-    # Redact and add metadata; do not mutate caller's dict.
-    redacted = _redact_deep(record, _DEFAULT_REDACT_KEYS)
-    payload = _with_metadata(redacted)
-
     # Serialize first so any serialization errors happen before file ops.
-    try:
-        line = _json_dumps(payload) + "\n"
-        data = line.encode("utf-8")
-    except Exception:  # JSON errors etc.
-        # Bubble up: caller (runner.py) has a fallback path.
-        raise
-
-    # Fast, atomic append using low-level os.open with O_APPEND.
-    flags = os.O_CREAT | os.O_APPEND | os.O_WRONLY
-
-    # 0o644 typical; umask may reduce this further
-    def _append_once() -> None:
-        fd = os.open(path, flags, 0o644)
-        try:
-            os.write(fd, data)  # Single write; O_APPEND ensures atomicity on POSIX.
-        finally:
-            os.close(fd)
-
-    try:
-        _append_once()
-    except OSError:
-        # Retry once (transient issues): re-check dir and try again.
-        _ensure_dir(path)
-        _rotate_file_if_needed(path)
-        _append_once()
+    # Bubble up on failure: caller (runner.py) has a fallback path.
+    data = _encode_line(record)
+    _FDS.append(path, data)
@@ -1,10 +1,14 @@
 # service/runner.py
 from __future__ import annotations
 
+import atexit
 import importlib
 import json
 import logging
 import os
+import sys
+import threading
+import time
 import uuid
 from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
@@ -16,12 +20,23 @@ from typing import Any
 
 from service.emailer import EmailSendError, send_html
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None
+
 # -----------------------------------------------------------------------------
 # Config / Environment
 # -----------------------------------------------------------------------------
 # Optional local JSONL sink if logging_utils is not available
 ACTIVITY_LOG_PATH = os.getenv("ACTIVITY_LOG_PATH", "/app/local/activity.log")
 
+# Shared worker pool for timed module runs (created on first use). Defaults to the
+# scheduler's default executor size (10) so concurrent jobs don't queue behind it.
+_RUNNER_POOL_SIZE = max(1, int(os.getenv("RUNNER_POOL_SIZE", "10")))
+_RUNNER_POOL: ThreadPoolExecutor | None = None
+_RUNNER_POOL_LOCK = threading.Lock()
+
 # -----------------------------------------------------------------------------
 # Optional imports (graceful fallback)
 # -----------------------------------------------------------------------------
@@ -76,12 +91,16 @@ def _html_email_fallback(title: str, body_inner_html: str) -> str:
 </html>"""
 
 
+_TRUE_SET = frozenset({"true", "t", "yes", "y", "1"})
+_FALSE_SET = frozenset({"false", "f", "no", "n", "0"})
+
+
 def _maybe_bool(v: Any) -> Any:
     if isinstance(v, str):
         low = v.strip().lower()
-        if low in ("true", "t", "yes", "y", "1"):
+        if low in _TRUE_SET:
             return True
-        if low in ("false", "f", "no", "n", "0"):
+        if low in _FALSE_SET:
             return False
     return v
 
@@ -123,47 +142,20 @@ def _normalize_kwargs_types(kwargs: dict[str, object] | None) -> dict[str, objec
     if not kwargs:
         return {}
 
-    def _resolve_env_name(name: str) -> str:
-        # Strictly use the string as an env var name; if missing, return empty string.
-        return os.getenv(name.strip(), "")
-
-    def _maybe_bool(v: Any) -> Any:
-        if isinstance(v, str):
-            low = v.strip().lower()
-            if low in ("true", "t", "yes", "y", "1"):
-                return True
-            if low in ("false", "f", "no", "n", "0"):
-                return False
-        return v
-
-    def _maybe_number(v: Any) -> Any:
-        if isinstance(v, str):
-            s = v.strip()
-            try:
-                # int?
-                if s and (s.isdigit() or (s.startswith("-") and s[1:].isdigit())):
-                    return int(s)
-            except Exception:
-                pass
-            try:
-                # float?
-                return float(s)
-            except Exception:
-                pass
-        return v
-
     normalized: dict[str, object] = {}
     for k, v in kwargs.items():
         # Keys ending with "_env" => look up env var by NAME provided in the value.
         if isinstance(k, str) and k.endswith("_env") and isinstance(v, str):
-            normalized[k] = _resolve_env_name(v)
+            # Strictly use the string as an env var name; if missing, empty string.
+            normalized[k] = os.getenv(v.strip(), "")
             continue
 
         # All other keys: run the usual string normalization.
         if isinstance(v, str):
             s = v.strip()
             # Prefer JSON if it looks like JSON
-            if (s.startswith("{") and s.endswith("}")) or (s.startswith("[") and s.endswith("]")):
+            first, last = s[:1], s[-1:]
+            if (first == "{" and last == "}") or (first == "[" and last == "]"):
                 try:
                     normalized[k] = json.loads(s)
                     continue
@@ -181,10 +173,55 @@ def _normalize_kwargs_types(kwargs: dict[str, object] | None) -> dict[str, objec
 
 def _resolve_callable(module_path: str) -> Callable[..., Any]:
     """Import module and return its `run` callable."""
-    mod = importlib.import_module(module_path)
-    if not hasattr(mod, "run") or not callable(mod.run):
+    # Already-imported modules come straight from sys.modules (no import lock); one
+    # still initializing in another thread goes through import_module to wait for it.
+    mod = sys.modules.get(module_path)
+    if mod is None or getattr(getattr(mod, "__spec__", None), "_initializing", False):
+        mod = importlib.import_module(module_path)
+    run = getattr(mod, "run", None)
+    if not callable(run):
         raise AttributeError(f"Module {module_path!r} does not define a callable `run(**kwargs)`.")
-    return mod.run  # type: ignore[no-any-return]
+    return run  # type: ignore[no-any-return]
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """
+    Return the process-wide runner pool, creating it on first use. Reusing its
+    threads avoids spawning and joining one per run. A run that times out keeps
+    its worker busy until the module returns; later runs use the other workers.
+    """
+    global _RUNNER_POOL
+    if _RUNNER_POOL is None:
+        with _RUNNER_POOL_LOCK:
+            if _RUNNER_POOL is None:
+                _RUNNER_POOL = ThreadPoolExecutor(max_workers=_RUNNER_POOL_SIZE, thread_name_prefix="runner")
+                atexit.register(_RUNNER_POOL.shutdown, wait=False)
+    return _RUNNER_POOL
+
+
+def _call_with_timeout(fn: Callable[[], Any], timeout_sec: float, module: str) -> Any:
+    """
+    Run fn on the pool, allowing it timeout_sec of execution once a worker picks it
+    up. Time spent queued behind busy workers is bounded separately (also timeout_sec);
+    a run still queued then is cancelled, so it can never start after being reported
+    as timed out. Raises FutureTimeout either way.
+    """
+    started = threading.Event()
+
+    def _task() -> Any:
+        started.set()
+        return fn()
+
+    fut = _get_pool().submit(_task)
+    if not started.wait(timeout_sec) and fut.cancel():
+        log.warning("Run of %s cancelled: still queued after %ss (runner pool busy)", module, timeout_sec)
+        raise FutureTimeout
+    try:
+        return fut.result(timeout=timeout_sec)
+    except FutureTimeout:
+        fut.cancel()  # no-op once running; Python threads cannot be interrupted
+        log.warning("Run of %s exceeded %ss; it keeps its worker until run() returns", module, timeout_sec)
+        raise
 
 
 def _wrap_html(subject: str, inner_html: str) -> str:
@@ -197,6 +234,16 @@ def _wrap_html(subject: str, inner_html: str) -> str:
     return _html_email_fallback(subject, inner_html)
 
 
+def _jsonl_bytes(record: dict[str, Any]) -> bytes:
+    """One UTF-8 JSONL line; orjson when installed, stdlib for anything it rejects."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+        except TypeError:  # orjson.JSONEncodeError subclasses it
+            pass
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
 def _emit_activity_jsonl(record: dict[str, Any]) -> None:
     """Write a structured activity record either via logging_utils or to a JSONL file."""
     if _write_activity_log:
@@ -208,8 +255,8 @@ def _emit_activity_jsonl(record: dict[str, Any]) -> None:
     # Local JSONL fallback
     try:
         os.makedirs(os.path.dirname(ACTIVITY_LOG_PATH), exist_ok=True)
-        with open(ACTIVITY_LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        with open(ACTIVITY_LOG_PATH, "ab") as f:
+            f.write(_jsonl_bytes(record))
     except Exception as e:
         log.error("Failed to write activity JSONL: %s", e)
 
@@ -336,7 +383,7 @@ def run_module_once(
     # Resolve module.run
     run_callable = _resolve_callable(module)
 
-    # Execute with timeout in a worker thread
+    # Execute (in a pool worker only when a timeout must be enforced)
     result: RunResult
     exc: BaseException | None = None
     duration_ms: int | None = None
@@ -344,11 +391,10 @@ def run_module_once(
     def _invoke() -> Any:
         return run_callable(**kw)
 
-    t0 = datetime.now()
+    t0 = time.perf_counter_ns()
     try:
-        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="runner") as pool:
-            fut = pool.submit(_invoke)
-            value = fut.result(timeout=timeout_sec) if timeout_sec else fut.result()
+        # No timeout to enforce: run inline, skipping the thread hop
+        value = _call_with_timeout(_invoke, timeout_sec, module) if timeout_sec else _invoke()
         result = _coerce_result(value)
     except FutureTimeout:
         exc = TimeoutError(f"Module run timed out after {timeout_sec}s")
@@ -357,7 +403,7 @@ def run_module_once(
         exc = e
         result = RunResult(ok=False, message=str(e), html=None, meta={"exception_type": type(e).__name__})
     finally:
-        duration_ms = int((datetime.now() - t0).total_seconds() * 1000)
+        duration_ms = (time.perf_counter_ns() - t0) // 1_000_000
 
     # Prepare email gating (env + kwarg precedence)
     # Hard override: dry-run disables sending no matter what.
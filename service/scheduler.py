@@ -88,17 +88,20 @@ class SchedulerController:
 # ---- Module API -------------------------------------------------------------
 
 
-def start(config_path: str | None = None) -> SchedulerController:
+def start(config_path: str | None = None, *, cfg: dict[str, Any] | None = None) -> SchedulerController:
     """
     Load configuration, build an APScheduler instance, add jobs, and start.
     Returns a SchedulerController that exposes stop() and join().
 
+    Pass an already-loaded `cfg` to skip reading `config_path` again.
+
     Notes:
       * APScheduler 3.x prefers a pytz scheduler timezone. Individual triggers
         can be constructed with zoneinfo; APS coerces internally. We keep the
         scheduler tz as pytz to avoid surprises.
     """
-    cfg = config_schema.load_config(config_path)
+    if cfg is None:
+        cfg = config_schema.load_config(config_path)
     tz = _resolve_timezone(cfg)
 
     # Reasonable defaults; tweak as your workload evolves.
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import pytest
+
+from modules.career_watch.lib.scrapers import lever
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def lever_html() -> str:
+    # Saved list page; starts with an XML declaration, which lxml rejects for str input
+    return (FIXTURES / "lever_list.html").read_text(encoding="utf-8")
+
+
+@pytest.mark.filterwarnings("ignore::bs4.XMLParsedAsHTMLWarning")
+def test_lever_list_page_with_xml_declaration(lever_html):
+    parsed = lever.LeverScraper()._parse_list_page(lever_html, query=None, exclude=["on-site", "internship"])
+    assert parsed == [("Senior Software Engineer", "https://jobs.lever.co/acme/1a2b3c")]
+
+
+@pytest.mark.filterwarnings("ignore::bs4.XMLParsedAsHTMLWarning")
+def test_lever_lxml_and_bs4_paths_agree(lever_html):
+    body = lever_html.split("?>", 1)[1]  # without the declaration, lxml parses it directly
+    via_lxml = list(lever.LeverScraper._iter_postings(body))
+    via_bs4 = list(lever.LeverScraper._iter_postings_bs4(lever_html))
+    assert via_lxml == via_bs4
+    assert [href for href, _t, _c in via_bs4] == [
+        "https://jobs.lever.co/acme/1a2b3c",
+        "https://jobs.lever.co/acme/4d5e6f",
+        "/acme/7a8b9c",
+    ]
+
+
+def test_workday_extract_jobs_drops_non_dict_items():
+    from modules.career_watch.lib.scrapers.workday_cxs import WorkdayCxSScraper
+
+    scraper = WorkdayCxSScraper.__new__(WorkdayCxSScraper)  # _extract_jobs needs no client
+    job = {"title": "Engineer", "externalPath": "/job/1"}
+    assert scraper._extract_jobs({"jobPostings": [job, None, "x", job]}) == [job, job]
+    assert scraper._extract_jobs({"body": {"jobPostings": [job, 3]}}) == [job]
+    assert scraper._extract_jobs({"jobPostings": "nope"}) == []
@@ -1,5 +1,5 @@
 # tests/test_career_watch_db.py
-from modules.career_watch.lib.db import count_rows, filter_new, init_db, reset_db
+from modules.career_watch.lib.db import count_rows, filter_new, http_cache_get, http_cache_put, init_db, reset_db
 from modules.career_watch.lib.models import Posting
 
 
@@ -21,3 +21,18 @@ def test_db_dedupe(tmp_path):
     new2 = filter_new(str(dbp), person, posts)
     assert len(new2) == 0
     assert count_rows(str(dbp)) == 2
+
+
+def test_http_cache_roundtrip(tmp_path):
+    dbp = str(tmp_path / "cw_http.db")
+    assert http_cache_get(dbp, "https://jobs.lever.co/acme") is None
+
+    http_cache_put(
+        dbp, "https://jobs.lever.co/acme", etag='"v1"', last_modified=None, body_sha256="aa", body="<a/>"
+    )
+    assert http_cache_get(dbp, "https://jobs.lever.co/acme") == ('"v1"', None, "aa", "<a/>")
+
+    # Upsert replaces validators; postings table is untouched
+    http_cache_put(dbp, "https://jobs.lever.co/acme", etag=None, last_modified="Tue", body_sha256="bb")
+    assert http_cache_get(dbp, "https://jobs.lever.co/acme") == (None, "Tue", "bb", "")
+    assert count_rows(dbp) == 0
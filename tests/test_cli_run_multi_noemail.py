@@ -1,3 +1,8 @@
+import math
+
+import pytest
+
+
 def test_cli_run_respects_no_email(stub_emailer, capsys):
     from service import cli
 
@@ -8,3 +13,42 @@ def test_cli_run_respects_no_email(stub_emailer, capsys):
     # CLI printed SUCCESS and HTML block
     out, _ = capsys.readouterr()
     assert "SUCCESS" in out or "DONE" in out
+
+
+def test_cli_version_after_global_option(capsys):
+    from service import cli
+
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["--config", "unused.yaml", "--version"])
+    assert exc.value.code == 0
+    out, _ = capsys.readouterr()
+    assert out.startswith("scheduled-modules ")
+
+
+def test_cli_kwargs_decode_json_values_like_json_loads():
+    from service import cli
+
+    out = cli._parse_kv_pairs([
+        "a=NaN",
+        "b=Infinity",
+        "c=-Infinity",
+        "d=[1, 2]",
+        "e=null",
+        "f=Nancy",
+        "g=Idaho",
+        "h=plain",
+    ])
+    assert math.isnan(out["a"])
+    assert out["b"] == math.inf and out["c"] == -math.inf
+    assert out["d"] == [1, 2] and out["e"] is None
+    assert (out["f"], out["g"], out["h"]) == ("Nancy", "Idaho", "plain")
+
+
+def test_cli_parser_looks_up_version_only_for_version_flag(monkeypatch):
+    from service import cli
+
+    def _fail():
+        raise AssertionError("version looked up without --version")
+
+    monkeypatch.setattr(cli, "_version", _fail)
+    assert cli._build_parser().parse_args(["list-jobs"]).cmd == "list-jobs"
@@ -1,3 +1,9 @@
+import math
+import os
+
+import pytest
+
+
 def test_load_and_validate_min_config(write_min_config):
     # Ensure load_config returns a structure with .jobs or ["jobs"]
     from service import config_schema
@@ -9,3 +15,53 @@ def test_load_and_validate_min_config(write_min_config):
     # optional validate()
     if hasattr(config_schema, "validate"):
         config_schema.validate(cfg)
+
+
+def test_load_config_reuses_parse_until_file_changes(tmp_path):
+    from service import config_schema
+
+    p = tmp_path / "cfg.json"
+    p.write_text('{"jobs": [{"module": "a", "daily_time": "07:00"}]}', encoding="utf-8")
+    first = config_schema.load_config(str(p))
+    first["jobs"].append({"module": "mutated"})  # caller mutation must not leak into the cache
+    assert [j["id"] for j in config_schema.load_config(str(p))["jobs"]] == ["a"]
+
+    p.write_text('{"jobs": [{"module": "b", "daily_time": "07:00"}]}', encoding="utf-8")
+    st = p.stat()
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert [j["id"] for j in config_schema.load_config(str(p))["jobs"]] == ["b"]
+
+
+def test_load_config_json_accepts_nan_and_infinity(tmp_path):
+    from service import config_schema
+
+    p = tmp_path / "cfg.json"
+    p.write_text(
+        '{"jobs": [{"module": "a", "daily_time": "07:00", "kwargs": {"lo": NaN, "hi": Infinity}}]}',
+        encoding="utf-8",
+    )
+    kw = config_schema.load_config(str(p))["jobs"][0]["kwargs"]
+    assert math.isnan(kw["lo"]) and kw["hi"] == math.inf
+
+    p.write_text('{"jobs": [', encoding="utf-8")
+    with pytest.raises(config_schema.ConfigError):
+        config_schema.load_config(str(p))
+
+
+def test_load_config_adds_no_private_keys_and_find_job_indexes_jobs(tmp_path):
+    from service import config_schema
+
+    p = tmp_path / "cfg.json"
+    p.write_text(
+        '{"jobs": [{"id": "a", "module": "m1", "daily_time": "07:00"},'
+        ' {"id": "a", "module": "m2", "daily_time": "08:00"}]}',
+        encoding="utf-8",
+    )
+    cfg = config_schema.load_config(str(p))
+    assert not [k for k in cfg if k.startswith("_")]
+    assert config_schema.find_job(cfg, "a")["module"] == "m1"  # first wins on duplicate ids
+    assert config_schema.find_job(cfg, "missing") is None
+
+    # A reloaded config (new jobs list) is re-indexed, not served from the old one
+    other = {"jobs": [{"id": "a", "module": "m3"}]}
+    assert config_schema.find_job(other, "a")["module"] == "m3"
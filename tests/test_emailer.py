@@ -0,0 +1,379 @@
+# tests/test_emailer.py
+from __future__ import annotations
+
+import smtplib
+import ssl
+import threading
+
+import pytest
+
+from service import emailer
+from service.emailer import EmailSendError, _is_retryable
+
+
+def _wrapped(cause: BaseException) -> EmailSendError:
+    try:
+        raise EmailSendError(f"SMTP send failed: {cause}") from cause
+    except EmailSendError as e:
+        return e
+
+
+@pytest.mark.parametrize(
+    "cause",
+    [
+        smtplib.SMTPServerDisconnected("Connection unexpectedly closed"),
+        smtplib.SMTPConnectError(421, b"Service not available"),
+        smtplib.SMTPResponseException(421, b"Try again later"),
+        smtplib.SMTPSenderRefused(451, b"Temporary local problem", "me@example.com"),
+        smtplib.SMTPRecipientsRefused({"a@example.com": (450, b"Greylisted")}),
+        TimeoutError("timed out"),
+        ConnectionRefusedError(111, "Connection refused"),
+    ],
+)
+def test_transient_smtp_errors_are_retried(cause):
+    assert _is_retryable(_wrapped(cause)) is True
+
+
+@pytest.mark.parametrize(
+    "cause",
+    [
+        smtplib.SMTPRecipientsRefused({"a@example.com": (550, b"No such user")}),
+        smtplib.SMTPRecipientsRefused({"a@example.com": (450, b"Later"), "b@example.com": (550, b"No")}),
+        smtplib.SMTPNotSupportedError("STARTTLS extension not supported by server."),
+        smtplib.SMTPAuthenticationError(535, b"Authentication failed"),
+        smtplib.SMTPDataError(554, b"Message rejected"),
+        smtplib.SMTPException("No suitable authentication method found."),
+        ssl.SSLCertVerificationError(1, "certificate verify failed"),
+        ssl.SSLError(1, "wrong version number"),
+        ValueError("bad header"),
+    ],
+)
+def test_permanent_smtp_errors_fail_fast(cause):
+    assert _is_retryable(_wrapped(cause)) is False
+
+
+def test_bridge_internal_error_text_stays_retryable():
+    assert _is_retryable(EmailSendError("SMTP send failed: 554 Internal server error")) is True
+
+
+def test_deliver_does_not_sleep_on_permanent_failure(monkeypatch):
+    calls = []
+
+    def _fail(batch, *, settings):
+        calls.append(batch)
+        raise _wrapped(smtplib.SMTPRecipientsRefused({"a@example.com": (550, b"No such user")}))
+
+    monkeypatch.setattr(emailer, "_send_batch_via_smtp", _fail)
+    monkeypatch.setattr(emailer.time, "sleep", lambda s: pytest.fail("slept on a permanent failure"))
+
+    msg = emailer.EmailMessage()
+    msg["Message-ID"] = "<x@example.com>"
+    with pytest.raises(EmailSendError):
+        emailer._deliver(msg, ["a@example.com"], {})
+    assert len(calls) == 1
+
+
+# ---- Connection pool -----------------------------------------------------------
+
+
+class _FakeSMTP:
+    """Stands in for a logged-in smtplib.SMTP session."""
+
+    def __init__(
+        self,
+        noop_code: int = 250,
+        fail_send: BaseException | None = None,
+        fail_after: int | None = None,
+        fail_err: BaseException | None = None,
+    ):
+        self.noop_code = noop_code
+        self.fail_send = fail_send
+        # Once this many sends succeeded, the next raises fail_err (default: the server drops)
+        self.fail_after = fail_after
+        self.fail_err = fail_err
+        self.sent: list[list[str]] = []
+        self.msg_ids: list[str | None] = []
+        self.closed = False
+
+    def noop(self):
+        if self.closed:
+            raise smtplib.SMTPServerDisconnected("please run connect() first")
+        return self.noop_code, b"OK"
+
+    def send_message(self, msg, to_addrs=None):
+        if self.fail_send is not None:
+            err, self.fail_send = self.fail_send, None
+            raise err
+        if self.fail_after is not None and len(self.sent) >= self.fail_after:
+            if self.fail_err is not None:
+                raise self.fail_err
+            self.closed = True
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append(list(to_addrs))
+        self.msg_ids.append(msg["Message-ID"])
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+_SETTINGS = {"host": "smtp.test", "port": 25, "username": "u", "use_ssl": False, "has_credentials": True}
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    """Fresh pool whose sessions come from a scripted list of _FakeSMTP objects."""
+    opened: list[_FakeSMTP] = []
+    scripted: list[_FakeSMTP] = []
+
+    def _open(settings):
+        server = scripted.pop(0) if scripted else _FakeSMTP()
+        opened.append(server)
+        return server
+
+    monkeypatch.setattr(emailer, "_open_session", _open)
+    monkeypatch.setattr(emailer, "_POOL", emailer._SMTPPool(ttl=60))
+    return opened, scripted
+
+
+def _send(to: str):
+    msg = emailer.EmailMessage()
+    emailer._send_batch_via_smtp([(msg, [to])], settings=_SETTINGS)
+
+
+def test_pool_reuses_session_between_sends(fake_pool):
+    opened, _ = fake_pool
+    _send("a@example.com")
+    _send("b@example.com")
+    assert len(opened) == 1
+    assert opened[0].sent == [["a@example.com"], ["b@example.com"]]
+    assert not opened[0].closed
+
+
+def test_pool_replaces_session_failing_noop(fake_pool):
+    opened, scripted = fake_pool
+    scripted.append(_FakeSMTP(noop_code=421))
+    _send("a@example.com")
+    _send("b@example.com")
+    assert len(opened) == 2
+    assert opened[0].closed and opened[0].sent == [["a@example.com"]]
+    assert opened[1].sent == [["b@example.com"]]
+
+
+def test_pool_replaces_session_past_ttl(fake_pool, monkeypatch):
+    opened, _ = fake_pool
+    monkeypatch.setattr(emailer, "_POOL", emailer._SMTPPool(ttl=0))
+    _send("a@example.com")
+    monkeypatch.setattr(emailer.time, "monotonic", lambda: 10**9)
+    _send("b@example.com")
+    assert len(opened) == 2
+    assert opened[0].closed
+
+
+def test_pooled_session_dropped_mid_send_reconnects_once(fake_pool):
+    opened, scripted = fake_pool
+    first = _FakeSMTP()
+    scripted.append(first)
+    _send("a@example.com")
+    first.fail_send = smtplib.SMTPServerDisconnected("gone")
+    _send("b@example.com")
+    assert len(opened) == 2
+    assert first.closed
+    assert opened[1].sent == [["b@example.com"]]
+
+
+def test_failed_session_is_closed_and_not_pooled(fake_pool):
+    opened, scripted = fake_pool
+    scripted.append(_FakeSMTP(fail_send=smtplib.SMTPDataError(554, b"rejected")))
+    with pytest.raises(EmailSendError):
+        _send("a@example.com")
+    assert opened[0].closed
+    _send("b@example.com")
+    assert len(opened) == 2
+    assert opened[1].sent == [["b@example.com"]]
+
+
+# ---- Envelope chunks and retries ---------------------------------------------------
+
+
+def _all_sent(opened: list[_FakeSMTP]) -> list[list[str]]:
+    return [rcpts for server in opened for rcpts in server.sent]
+
+
+def test_envelopes_split_recipients_into_chunks(monkeypatch):
+    monkeypatch.setattr(emailer, "_MAIL_CHUNK", 2)
+    msg = emailer.EmailMessage()
+    envs = emailer._envelopes(msg, ["a@x", "b@x", "c@x", "d@x", "e@x"])
+    assert [rcpts for _m, rcpts in envs] == [["a@x", "b@x"], ["c@x", "d@x"], ["e@x"]]
+    assert all(m is msg for m, _r in envs)  # same message re-sent per slice
+
+
+def test_envelopes_keep_small_lists_in_one_transaction(monkeypatch):
+    monkeypatch.setattr(emailer, "_MAIL_CHUNK", 2)
+    msg = emailer.EmailMessage()
+    assert emailer._envelopes(msg, ["a@x", "b@x"]) == [(msg, ["a@x", "b@x"])]
+
+
+def test_envelopes_group_by_domain_then_chunk(monkeypatch):
+    monkeypatch.setattr(emailer, "_BATCH_BY_DOMAIN", True)
+    monkeypatch.setattr(emailer, "_MAIL_CHUNK", 2)
+    msg = emailer.EmailMessage()
+    rcpts = ["a@one.org", "b@Two.org", "c@ONE.org", "d@two.org", "e@one.org", "nodomain"]
+    # Domains in first-seen order, case-insensitive; each domain chunked on its own
+    assert [r for _m, r in emailer._envelopes(msg, rcpts)] == [
+        ["a@one.org", "c@ONE.org"],
+        ["e@one.org"],
+        ["b@Two.org", "d@two.org"],
+        ["nodomain"],
+    ]
+
+
+def test_deliver_by_domain_does_not_resend_delivered_domains(fake_pool, monkeypatch):
+    opened, scripted = fake_pool
+    monkeypatch.setattr(emailer, "_BATCH_BY_DOMAIN", True)
+    monkeypatch.setattr(emailer.time, "sleep", lambda s: None)
+    scripted.append(_FakeSMTP(fail_after=1))  # drops on the second domain's transaction
+
+    msg = emailer.EmailMessage()
+    msg["Message-ID"] = "<x@example.com>"
+    emailer._deliver(msg, ["a@one.org", "b@two.org", "c@one.org"], _SETTINGS)
+    assert _all_sent(opened) == [["a@one.org", "c@one.org"], ["b@two.org"]]
+
+
+def test_deliver_does_not_resend_chunks_already_delivered(fake_pool, monkeypatch):
+    opened, scripted = fake_pool
+    monkeypatch.setattr(emailer, "_MAIL_CHUNK", 2)
+    monkeypatch.setattr(emailer.time, "sleep", lambda s: None)
+    scripted.append(_FakeSMTP(fail_after=1))  # drops on the second transaction
+
+    msg = emailer.EmailMessage()
+    msg["Message-ID"] = "<x@example.com>"
+    emailer._deliver(msg, ["a@x", "b@x", "c@x", "d@x"], _SETTINGS)
+    assert _all_sent(opened) == [["a@x", "b@x"], ["c@x", "d@x"]]
+
+
+def test_deliver_retries_only_the_failing_chunk(fake_pool, monkeypatch):
+    opened, scripted = fake_pool
+    monkeypatch.setattr(emailer, "_MAIL_CHUNK", 2)
+    sleeps: list[float] = []
+    monkeypatch.setattr(emailer.time, "sleep", sleeps.append)
+    # Second chunk: pooled session drops, the reconnect drops too -> one retry on a third session
+    scripted.extend([_FakeSMTP(fail_after=1), _FakeSMTP(fail_after=0)])
+
+    msg = emailer.EmailMessage()
+    msg["Message-ID"] = "<x@example.com>"
+    emailer._deliver(msg, ["a@x", "b@x", "c@x"], _SETTINGS)
+    assert _all_sent(opened) == [["a@x", "b@x"], ["c@x"]]
+    assert len(sleeps) == 1
+
+
+def test_deliver_reports_chunks_sent_before_a_permanent_failure(fake_pool, monkeypatch):
+    opened, scripted = fake_pool
+    monkeypatch.setattr(emailer, "_MAIL_CHUNK", 1)
+    monkeypatch.setattr(emailer.time, "sleep", lambda s: pytest.fail("slept on a permanent failure"))
+    scripted.append(_FakeSMTP(fail_after=1, fail_err=smtplib.SMTPDataError(554, b"rejected")))
+
+    msg = emailer.EmailMessage()
+    msg["Message-ID"] = "<x@example.com>"
+    with pytest.raises(EmailSendError, match="after 1/2 transactions"):
+        emailer._deliver(msg, ["a@x", "b@x"], _SETTINGS)
+    assert _all_sent(opened) == [["a@x"]]
+
+
+# ---- Background outbox (send_html(sync=False)) ------------------------------------
+
+_MSG_SETTINGS = {**_SETTINGS, "default_from_name": "Svc", "default_from_addr": "svc@example.com"}
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    """Fresh two-thread outbox; _deliver waits for `release`, then records (message-id, recipients)."""
+    box = emailer._Outbox(2)
+    release = threading.Event()
+    delivered: list[tuple[str, list[str]]] = []
+    exit_hooks: list = []
+    monkeypatch.setattr(emailer, "_OUTBOX", box)
+    monkeypatch.setattr(emailer, "_resolve_smtp_settings", lambda: _MSG_SETTINGS)
+    monkeypatch.setattr(emailer.atexit, "register", exit_hooks.append)
+
+    def _deliver(msg, rcpt_to, settings):
+        release.wait(5)
+        delivered.append((str(msg["Message-ID"]), rcpt_to))
+        return str(msg["Message-ID"])
+
+    monkeypatch.setattr(emailer, "_deliver", _deliver)
+    yield box, delivered, exit_hooks, release
+    release.set()
+    box.drain(timeout=5)
+
+
+def test_send_html_async_returns_before_delivery_and_drain_flushes(outbox):
+    box, delivered, exit_hooks, release = outbox
+    ids = [emailer.send_html(subject=f"s{i}", html="<p>x</p>", to=[f"r{i}@x"], sync=False) for i in range(5)]
+    assert delivered == []  # queued; senders are still blocked
+    assert exit_hooks == [box.drain]  # drained at exit, ahead of the pool's close_all
+
+    release.set()
+    box.drain(timeout=5)
+    assert sorted(delivered) == sorted((mid, [f"r{i}@x"]) for i, mid in enumerate(ids))
+    assert not any(t.is_alive() for t in box._threads)
+
+
+def test_send_html_async_failure_is_logged_not_raised(outbox, monkeypatch, caplog):
+    box, _delivered, _, _release = outbox
+
+    def _fail(msg, rcpt_to, settings):
+        raise EmailSendError("SMTP send failed: 554 rejected")
+
+    monkeypatch.setattr(emailer, "_deliver", _fail)
+    mid = emailer.send_html(subject="s", html="<p>x</p>", to=["a@x"], sync=False)
+    box.drain(timeout=5)
+    assert any("Background send failed" in r.message and mid in r.message for r in caplog.records)
+
+
+def test_send_html_async_still_validates_in_caller(outbox):
+    box, delivered, _, _release = outbox
+    with pytest.raises(EmailSendError, match="No recipients"):
+        emailer.send_html(subject="s", html="<p>x</p>", to=[], sync=False)
+    assert box._threads == [] and delivered == []
+
+
+# ---- send_html_batch -----------------------------------------------------------------
+
+
+@pytest.fixture
+def batch_settings(monkeypatch):
+    monkeypatch.setattr(emailer, "_resolve_smtp_settings", lambda: _MSG_SETTINGS)
+
+
+def _batch(n: int) -> list[dict]:
+    return [{"subject": f"s{i}", "html": "<p>x</p>", "to": [f"r{i}@x"]} for i in range(n)]
+
+
+def test_send_html_batch_sends_in_order_over_one_session(fake_pool, batch_settings):
+    opened, _ = fake_pool
+    ids = emailer.send_html_batch(_batch(3))
+    assert len(opened) == 1
+    assert opened[0].sent == [["r0@x"], ["r1@x"], ["r2@x"]]
+    assert ids == opened[0].msg_ids  # returned in input (= send) order
+    assert len(set(ids)) == 3
+
+
+def test_send_html_batch_partial_failure_reports_progress_and_does_not_retry(fake_pool, batch_settings):
+    opened, scripted = fake_pool
+    scripted.append(_FakeSMTP(fail_after=1, fail_err=smtplib.SMTPDataError(554, b"rejected")))
+    with pytest.raises(EmailSendError, match="after 1/3 transactions"):
+        emailer.send_html_batch(_batch(3))
+    assert _all_sent(opened) == [["r0@x"]]
+    assert opened[0].closed
+
+
+def test_send_html_batch_validates_everything_before_sending(fake_pool, batch_settings):
+    opened, _ = fake_pool
+    messages = _batch(2)
+    messages[1]["to"] = []
+    with pytest.raises(EmailSendError, match="No recipients"):
+        emailer.send_html_batch(messages)
+    assert opened == []
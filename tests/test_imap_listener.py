@@ -0,0 +1,19 @@
+from service import imap_listener
+
+
+def test_body_groups_cap_total_size(monkeypatch):
+    monkeypatch.setattr(imap_listener, "_BODY_BATCH_BYTES", 100)
+    sizes = {1: 40, 2: 50, 3: 20, 4: 300, 5: 10}
+    # 1+2 fit, 3 would overflow; 4 alone exceeds the budget but still gets a group
+    assert imap_listener._body_groups([1, 2, 3, 4, 5], sizes) == [[1, 2], [3], [4], [5]]
+    assert imap_listener._body_groups([], sizes) == []
+
+
+def test_fetch_bodies_failure_leaves_messages_for_single_fetch():
+    class _Client:
+        def fetch(self, uids, items):
+            raise OSError("connection reset")
+
+    fetched = {1: {b"ENVELOPE": None}}
+    imap_listener._fetch_bodies(_Client(), [1], fetched)
+    assert imap_listener._BODY_KEY not in fetched[1]
@@ -0,0 +1,22 @@
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from service.imap_commands import templates
+
+
+def _noop(**_kwargs):
+    pass
+
+
+def test_list_html_run_button_encodes_first_id():
+    sched = BackgroundScheduler()
+    sched.start(paused=True)  # scheduled jobs carry next_run_time; pending ones do not
+    try:
+        job = sched.add_job(_noop, "interval", minutes=5, id="a&b <x>", kwargs={"module": "m"})
+        html = templates.list_html([job], first_id=job.id)
+    finally:
+        sched.shutdown(wait=False)
+
+    # Percent-encoded inside the mailto query, HTML-escaped in the link text
+    assert "subject=RUN%20MODULE%3Da%26b%20%3Cx%3E&body=RUN%20MODULE%3Da%26b%20%3Cx%3E%0A" in html
+    assert "Run a&amp;b &lt;x&gt; Now" in html
+    assert "<x>" not in html
@@ -0,0 +1,134 @@
+import copy
+import json
+import re
+from typing import Any
+
+import pytest
+
+from service import logging_utils as lu
+
+# ---- Reference: the encoder as it was before the iterative walk / _meta splice ----
+
+
+def _ref_redact_deep(value: Any, matcher: re.Pattern[str]) -> Any:
+    if isinstance(value, dict):
+        out: dict[Any, Any] = {}
+        for k, v in value.items():
+            if isinstance(k, str) and lu._key_matches(k, matcher):
+                out[k] = "***REDACTED***"
+            else:
+                out[k] = _ref_redact_deep(v, matcher)
+        return out
+    if isinstance(value, list):
+        return [_ref_redact_deep(v, matcher) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_ref_redact_deep(v, matcher) for v in value)
+    if isinstance(value, str):
+        return lu._safe_bearer_scrub(value)
+    return value
+
+
+def _ref_encode_line(record: dict[str, Any]) -> bytes:
+    return lu._json_line(lu._with_metadata(_ref_redact_deep(record, lu._DEFAULT_REDACT_RE)))
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(lu, "orjson", None)
+    elif lu.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+SECRET_RECORDS = [
+    pytest.param({"user": "ann", "password": "hunter2"}, id="flat"),
+    pytest.param({"cfg": {"smtp_user": "u", "inner": {"API_KEY": "k", "ok": 1}}}, id="nested-dict"),
+    pytest.param({"items": [{"token": "t"}, "plain", ["Bearer abc.def", {"Cookie": "c"}]]}, id="list"),
+    pytest.param({"pair": ({"secret": "s"}, ("Bearer x", 2)), "n": None}, id="tuple"),
+    pytest.param({"a": [({"b": [{"authorization": "Basic zzz"}]},)]}, id="mixed-depth"),
+    pytest.param({"hdr": "bearer only-one-word", "x": "bearer"}, id="bearer-edge"),
+    pytest.param({1: {"set-cookie": "c"}, "f": 1.5, "t": True}, id="non-str-keys"),
+]
+
+
+@pytest.mark.parametrize("record", SECRET_RECORDS)
+def test_redact_deep_matches_recursive_reference(record):
+    got = lu._redact_deep(record, lu._DEFAULT_REDACT_RE)
+    want = _ref_redact_deep(record, lu._DEFAULT_REDACT_RE)
+    assert got == want
+    assert repr(got) == repr(want)  # same key order and same list/tuple types
+
+
+@pytest.mark.parametrize("record", SECRET_RECORDS)
+def test_encode_line_matches_reference_for_secrets(encoder, record):
+    before = copy.deepcopy(record)
+    assert lu._encode_line(record) == _ref_encode_line(record)
+    assert record == before  # caller's dict is never mutated
+    assert b"hunter2" not in lu._encode_line(record)
+
+
+def test_redact_deep_handles_nesting_past_the_recursion_limit():
+    deep: Any = {"password": "p"}
+    for _ in range(5000):
+        deep = [deep]
+    out = lu._redact_deep({"d": deep}, lu._DEFAULT_REDACT_RE)["d"]
+    for _ in range(5000):
+        out = out[0]
+    assert out == {"password": "***REDACTED***"}
+
+
+def test_redact_deep_rejects_cyclic_record():
+    d: dict[str, Any] = {"password": "p", "nested": {"rows": []}}
+    d["nested"]["rows"].append((d,))
+    with pytest.raises(ValueError, match="Circular"):
+        lu._redact_deep(d, lu._DEFAULT_REDACT_RE)
+    with pytest.raises(ValueError, match="Circular"):
+        lu.write_activity_log(d)  # _needs_redaction returns at "password" first
+
+
+def test_redact_deep_copies_shared_subobjects_like_reference():
+    shared = {"token": "t", "v": [1]}
+    record = {"a": shared, "b": [shared, (shared,)]}
+    assert repr(lu._redact_deep(record, lu._DEFAULT_REDACT_RE)) == repr(
+        _ref_redact_deep(record, lu._DEFAULT_REDACT_RE)
+    )
+
+
+META_RECORDS = [
+    pytest.param({}, id="empty"),
+    pytest.param({"module": "m", "ok": True}, id="no-meta"),
+    pytest.param({"_meta": {"trace": "abc", "host": "spoofed"}, "x": 1}, id="caller-meta-merged"),
+    pytest.param({"x": 1, "_meta": "not-a-dict"}, id="caller-meta-non-dict"),
+    pytest.param({"_meta": {}}, id="caller-meta-empty"),
+    pytest.param({"token": "t", "_meta": {"password": "p"}}, id="caller-meta-redacted"),
+    pytest.param({2: "int-key", "s": "ünïcødé"}, id="non-str-key-unicode"),
+]
+
+
+@pytest.mark.parametrize("record", META_RECORDS)
+def test_encode_line_meta_matches_reference(encoder, record):
+    before = copy.deepcopy(record)
+    assert lu._encode_line(record) == _ref_encode_line(record)
+    assert record == before
+
+
+def test_meta_fragment_is_last_and_carries_host_pid(encoder):
+    line = lu._encode_line({"a": 1})
+    assert line.endswith(b"," + lu._META_FRAGMENT + b"}\n")
+    assert json.loads(line)["_meta"] == {"host": lu._HOSTNAME, "pid": lu._PID}
+
+
+def test_needs_redaction_rejects_cyclic_record():
+    d: dict[str, Any] = {"a": 1, "items": []}
+    d["items"].append(("x", d))
+    with pytest.raises(ValueError, match="Circular"):
+        lu._needs_redaction(d, lu._DEFAULT_REDACT_RE)
+    with pytest.raises(ValueError, match="Circular"):
+        lu.write_activity_log(d)
+
+
+def test_needs_redaction_allows_shared_subobjects():
+    shared = {"k": [1, 2]}
+    assert lu._needs_redaction({"a": shared, "b": [shared, (shared,)]}, lu._DEFAULT_REDACT_RE) is False
+    assert lu._needs_redaction({"a": shared, "b": {"token": "t"}}, lu._DEFAULT_REDACT_RE) is True
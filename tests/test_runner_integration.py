@@ -1,4 +1,10 @@
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import pytest
 
 
 def test_runner_calls_module_and_returns_html(stub_emailer, frozen_utc):
@@ -32,3 +38,35 @@ def test_runner_email_path_when_enabled(stub_emailer, frozen_utc, monkeypatch):
     assert len(sent) == 1
     assert sent[0]["subject"].startswith("[test] subject override")
     assert "html" in sent[0]
+
+
+def test_timed_run_still_queued_is_cancelled_not_run_late(monkeypatch):
+    from service import runner
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(runner, "_RUNNER_POOL", pool)
+    release = threading.Event()
+    pool.submit(release.wait)  # occupy the only worker
+
+    ran = []
+    with pytest.raises(FutureTimeout):
+        runner._call_with_timeout(lambda: ran.append(1), 0.2, "modules.late_chime")
+    release.set()
+    pool.shutdown(wait=True)
+    assert ran == []  # reported as timed out, so it must never run afterwards
+
+
+def test_timed_run_timeout_excludes_queue_wait(monkeypatch):
+    from service import runner
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(runner, "_RUNNER_POOL", pool)
+    pool.submit(time.sleep, 0.3)  # busy worker: the next run waits ~0.3s in the queue
+
+    def _work():
+        time.sleep(0.4)
+        return "done"
+
+    # 0.3s queued + 0.4s running exceeds 0.6s, but the run itself fits
+    assert runner._call_with_timeout(_work, 0.6, "modules.slow") == "done"
+    pool.shutdown(wait=True)
@@ -0,0 +1,56 @@
+# tests/test_sonos_playback.py
+from __future__ import annotations
+
+import queue
+import time
+from types import SimpleNamespace
+
+from modules.sonos.lib.playback import _drain_events, _wait_for_playback_end
+
+
+class _FakeCoord:
+    """Polled transport state; only consulted when no event arrives in time."""
+
+    def __init__(self, state: str = "PLAYING"):
+        self.state = state
+        self.polls = 0
+
+    def get_current_transport_info(self):
+        self.polls += 1
+        return {"current_transport_state": self.state}
+
+
+def _sub_with(*states: str):
+    q: queue.Queue = queue.Queue()
+    for st in states:
+        q.put(SimpleNamespace(variables={"transport_state": st}))
+    return SimpleNamespace(events=q)
+
+
+def test_initial_playing_notify_is_drained_before_play():
+    sub = _sub_with("PLAYING")  # GENA initial NOTIFY: music was already playing
+    _drain_events(sub)
+    for st in ("TRANSITIONING", "PLAYING", "STOPPED"):  # caused by play_uri
+        sub.events.put(SimpleNamespace(variables={"transport_state": st}))
+
+    saw_playing, finished = _wait_for_playback_end(_FakeCoord(), time.monotonic() + 2, sub)
+    assert (saw_playing, finished) == (True, True)
+    assert sub.events.empty()  # ended on STOPPED, not on TRANSITIONING
+
+
+def test_late_stale_playing_event_does_not_end_wait_on_transitioning():
+    # Initial NOTIFY arrives only after play_uri returned, ahead of the chime's own events
+    sub = _sub_with("PLAYING", "TRANSITIONING", "PLAYING", "PAUSED_PLAYBACK")
+    saw_playing, finished = _wait_for_playback_end(_FakeCoord(), time.monotonic() + 2, sub)
+    assert (saw_playing, finished) == (True, True)
+    assert sub.events.empty()
+
+
+def test_stale_playing_then_transitioning_only_times_out():
+    # Without the chime ever reaching PLAYING via events, the TRANSITIONING after the
+    # stale PLAYING must not be read as "finished"
+    coord = _FakeCoord(state="TRANSITIONING")
+    sub = _sub_with("PLAYING", "TRANSITIONING")
+    saw_playing, finished = _wait_for_playback_end(coord, time.monotonic() + 0.3, sub)
+    assert finished is False
+    assert saw_playing is False